@@ -26,15 +26,4 @@ print("ND Super Nodes: Module loaded successfully")
 # This is the crucial part that makes the `web` directory available.
 WEB_DIRECTORY = "./web"
 
-# Register web API routes if server is available
-try:
-    from server import PromptServer
-    from .backend.web_api import register_routes
-    
-    # Register our API routes
-    register_routes(PromptServer.instance.app)
-    print("ND Super Nodes: Web API routes registered")
-except ImportError:
-    print("ND Super Nodes: Server not available, skipping web API registration")
-except Exception as e:
-    print(f"ND Super Nodes: Failed to register web API routes: {e}")
+# API routes are registered by the backend package when PromptServer is available
@@ -22,19 +22,33 @@ NODE_DISPLAY_NAME_MAPPINGS = {
 
 __all__ = ["NODE_CLASS_MAPPINGS", "NODE_DISPLAY_NAME_MAPPINGS"]
 
-# Register HTTP routes with ComfyUI's PromptServer when available
+# Register HTTP routes with ComfyUI's PromptServer when available.
+# The API modules are only imported once a server is present, so plain imports
+# (tests, tooling) skip aiohttp and the template/CivitAI/version services.
 try:
-    from .web_api import register_routes as _register_super_lora_routes
-    from .file_api import register_file_api_routes as _register_file_api_routes
+    from server import PromptServer as _PromptServer  # ComfyUI's server
+except Exception:
+    _PromptServer = None
+
+
+def _routes_registered(app) -> bool:
+    """Return True when our routes are already on the app (e.g. imported twice via sys.path)."""
+    router = getattr(app, "router", None)
+    if router is None:
+        return False
+    return any(getattr(r, "canonical", None) == "/super_lora/loras" for r in router.resources())
+
+
+if _PromptServer is not None:
     try:
-        from server import PromptServer  # ComfyUI's server
-        _app = getattr(PromptServer.instance, "app", None) or PromptServer.instance
-        if _app:
+        from .web_api import register_routes as _register_super_lora_routes
+        from .file_api import register_file_api_routes as _register_file_api_routes
+        _app = getattr(_PromptServer.instance, "app", None) or _PromptServer.instance
+        if _app and not _routes_registered(_app):
             _register_super_lora_routes(_app)
             _register_file_api_routes(_app)
             print("ND Super Nodes: API routes registered")
+        from .lora_utils import start_lora_watcher as _start_lora_watcher
+        _start_lora_watcher()
     except Exception as _e:
         print(f"ND Super Nodes: Failed to register API routes: {_e}")
-except Exception:
-    # Safe to ignore if web_api is unavailable in certain environments
-    pass
@@ -5,8 +5,10 @@ CivitAI API integration for automatic trigger word fetching
 import asyncio
 import aiohttp
 import hashlib
-from typing import Optional, List, Dict, Any
+import os
+from typing import Optional, List, Dict, Any, Tuple
 
+from .io_utils import run_blocking, run_bulk_io
 from .lora_utils import resolve_lora_full_path
 
 try:
@@ -28,6 +30,8 @@ class CivitAiService:
     def __init__(self):
         self._session: Optional[aiohttp.ClientSession] = None
         self._cache: Dict[str, Dict[str, Any]] = {}
+        # File path -> (mtime_ns, size, SHA256); a LoRA is only re-hashed when it changes
+        self._hash_cache: Dict[str, Tuple[int, int, str]] = {}
     
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session."""
@@ -51,11 +55,17 @@ class CivitAiService:
             SHA256 hash string, or None if error
         """
         try:
+            stat = os.stat(file_path)
+            cached = self._hash_cache.get(file_path)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                return cached[2]
             hash_sha256 = hashlib.sha256()
             with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
                     hash_sha256.update(chunk)
-            return hash_sha256.hexdigest().upper()
+            digest = hash_sha256.hexdigest().upper()
+            self._hash_cache[file_path] = (stat.st_mtime_ns, stat.st_size, digest)
+            return digest
         except Exception as e:
             print(f"CivitAI Service: Error calculating hash for '{file_path}': {e}")
             return None
@@ -108,13 +118,14 @@ class CivitAiService:
             return []
             
         try:
-            full_path = resolve_lora_full_path(lora_filename)
+            # Resolving may scan the LoRA folders and hashing reads the whole
+            # file, so neither runs on the event loop
+            full_path = await run_blocking(resolve_lora_full_path, lora_filename)
             if not full_path:
                 print(f"CivitAI Service: LoRA file '{lora_filename}' not found in configured directories")
                 return []
             
-            # Calculate file hash
-            file_hash = self._calculate_file_hash(full_path)
+            file_hash = await run_bulk_io(self._calculate_file_hash, full_path)
             if not file_hash:
                 return []
             
@@ -78,33 +78,35 @@ class FileAPI:
                     continue
 
                 try:
-                    for filename in os.listdir(folder_path):
-                        filepath = os.path.join(folder_path, filename)
-
-                        # Check if it's a file (not directory)
-                        if not os.path.isfile(filepath):
-                            continue
-
-                        # Check extension
-                        _, ext = os.path.splitext(filename)
-                        if ext.lower() not in supported_extensions and supported_extensions != {""}:
-                            continue
-
-                        # Get file stats
-                        try:
-                            stat = os.stat(filepath)
-                            file_info = {
-                                'name': filename,
-                                'path': filepath,
-                                'relative_path': os.path.relpath(filepath, folder_path),
-                                'extension': ext.lower(),
-                                'size': stat.st_size,
-                                'modified': stat.st_mtime
-                            }
-                            all_files.append(file_info)
-                        except (OSError, IOError):
-                            # Skip files we can't stat
-                            continue
+                    # scandir reports the entry type from the directory listing,
+                    # so the file check costs no extra stat per entry
+                    with os.scandir(folder_path) as entries:
+                        for entry in entries:
+                            # Check if it's a file (not directory)
+                            if not entry.is_file():
+                                continue
+
+                            # Check extension
+                            filename = entry.name
+                            _, ext = os.path.splitext(filename)
+                            if ext.lower() not in supported_extensions and supported_extensions != {""}:
+                                continue
+
+                            # Get file stats
+                            try:
+                                stat = entry.stat()
+                                file_info = {
+                                    'name': filename,
+                                    'path': entry.path,
+                                    'relative_path': filename,
+                                    'extension': ext.lower(),
+                                    'size': stat.st_size,
+                                    'modified': stat.st_mtime
+                                }
+                                all_files.append(file_info)
+                            except (OSError, IOError):
+                                # Skip files we can't stat
+                                continue
 
                 except (OSError, IOError) as e:
                     print(f"Warning: Could not read folder {folder_path}: {e}")
@@ -161,24 +163,18 @@ class FileAPI:
             Dict with search results
         """
         all_results = []
+        query_lower = query.lower()
 
         folders_to_search = [folder_name] if folder_name else FILE_TYPE_FOLDERS.values()
 
         for search_folder in folders_to_search:
             folder_info = FileAPI.get_files_for_folder(search_folder, [])
-            files = folder_info.get('files', [])
 
-            # Filter files by query
-            query_lower = query.lower()
-            matching_files = [
-                file for file in files
-                if query_lower in file['name'].lower()
-            ]
-
-            # Add folder context to results
-            for file in matching_files:
-                file['folder_type'] = search_folder
-                all_results.append(file)
+            # Filter files by query and add folder context in one pass
+            for file in folder_info.get('files', []):
+                if query_lower in file['name'].lower():
+                    file['folder_type'] = search_folder
+                    all_results.append(file)
 
         return {
             'query': query,
@@ -241,10 +237,21 @@ def register_file_api_routes(app):
             except Exception as e:
                 return aiohttp_web.json_response({'error': str(e)}, status=500)
 
-        app.router.add_get('/superlora/files', aio_get_files)
-        app.router.add_get('/superlora/folders', aio_get_folders)
-        app.router.add_get('/superlora/search', aio_search_files)
-        app.router.add_get('/superlora/file_info/{filepath:.*}', aio_get_file_info)
+        # web_api serves GET /superlora/files itself; skip anything already routed so
+        # the dispatcher does not carry unreachable duplicates
+        registered = {
+            (route.method, resource.canonical)
+            for resource in app.router.resources()
+            for route in resource
+        }
+        for path, handler in (
+            ('/superlora/files', aio_get_files),
+            ('/superlora/folders', aio_get_folders),
+            ('/superlora/search', aio_search_files),
+            ('/superlora/file_info/{filepath:.*}', aio_get_file_info),
+        ):
+            if ('GET', path) not in registered:
+                app.router.add_get(path, handler)
         print('File API: aiohttp routes registered')
         return
 
@@ -0,0 +1,25 @@
+"""
+Blocking I/O helpers for ND Super Nodes
+
+Filesystem work (directory scans, template files, LoRA metadata) runs on one
+small pool rather than the loop's default executor shared with ComfyUI.
+Whole-file reads such as LoRA hashing get a separate pool, so a batch of
+multi-GB files can't hold up listings and template I/O.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+
+_EXEC = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="nd-super-nodes-io")
+_BULK_EXEC = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="nd-super-nodes-bulk")
+
+
+def run_blocking(func, *args):
+    """Run func(*args) on the shared I/O pool; returns an awaitable future."""
+    return asyncio.get_running_loop().run_in_executor(_EXEC, functools.partial(func, *args))
+
+
+def run_bulk_io(func, *args):
+    """Run a long whole-file read func(*args) on the bulk pool; returns an awaitable future."""
+    return asyncio.get_running_loop().run_in_executor(_BULK_EXEC, functools.partial(func, *args))
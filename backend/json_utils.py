@@ -0,0 +1,73 @@
+"""
+JSON helpers for ND Super Nodes
+
+Uses orjson when it is installed and falls back to the standard library.
+"""
+
+import json
+import os
+from typing import Any, Union
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional speedup, not a hard dependency
+    orjson = None
+
+# Reused standard-library codecs for the fallback path
+_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_PRETTY_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=2)
+_DECODER = json.JSONDecoder()
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """
+    Parse a JSON document.
+
+    Raises ValueError on invalid input with either backend.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, (bytes, bytearray)):
+        data = data.decode("utf-8")
+    return _DECODER.decode(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize obj to UTF-8 encoded JSON bytes, keeping non-ASCII text as-is.
+
+    indent=True produces 2-space indented output for human-edited files.
+    """
+    if orjson is not None:
+        try:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+            return orjson.dumps(obj, option=option)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; let the standard library handle it
+    encoder = _PRETTY_ENCODER if indent else _ENCODER
+    return encoder.encode(obj).encode("utf-8")
+
+
+def write_json(path: str, obj: Any, indent: bool = False, durable: bool = False) -> None:
+    """
+    Atomically replace the file at path with the JSON encoding of obj.
+
+    The data is written to a sibling temporary file that is moved over path
+    with os.replace, so a crash mid-write never leaves a truncated file.
+    durable=True also fsyncs the data before the rename.
+    """
+    payload = dumps(obj, indent=indent)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -2,8 +2,16 @@
 LoRA utility functions for the Super LoRA Loader
 """
 
+import functools
 import os
-from typing import Optional, List, Dict, Any, Set
+import re
+import stat
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Iterable, Set, Tuple, FrozenSet
 import json
 
 try:
@@ -14,6 +22,424 @@ except ImportError:
     folder_paths = None
     COMFYUI_AVAILABLE = False
 
+try:
+    from watchdog.events import FileSystemEventHandler  # type: ignore
+    from watchdog.observers import Observer  # type: ignore
+except ImportError:  # optional; caches fall back to mtime checks
+    FileSystemEventHandler = object  # type: ignore
+    Observer = None
+
+
+# Fallback when folder_paths does not expose the LoRA extension filter
+_DEFAULT_LORA_EXTENSIONS = {'.ckpt', '.pt', '.pt2', '.bin', '.pth', '.safetensors', '.pkl', '.sft'}
+_EXCLUDED_DIR_NAMES = {'.git'}
+
+# safetensors caps the JSON header at 100MB; anything larger is not a safetensors file
+_MAX_SAFETENSORS_HEADER = 100 * 1024 * 1024
+
+# Metadata keys already handled explicitly before the generic trigger-key fallback
+_KOHYA_METADATA_KEYS = frozenset({'ss_tag_frequency', 'ss_trained_words'})
+
+# Numeric strings accepted for LoRA strengths
+_FLOAT_RE = re.compile(r'\s*[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?\s*$')
+
+# Upper bound on concurrent metadata reads in extract_trigger_words_many
+_TRIGGER_WORD_WORKERS = 8
+
+# Per base directory: (signature, relative file paths, the same paths as a set).
+# The signature lists the mtime of every directory seen during the scan, so
+# nested changes are noticed.
+_SCAN_CACHE: Dict[str, Tuple[Tuple[Tuple[str, int], ...], List[str], FrozenSet[str]]] = {}
+
+# Identifiers that recently failed to resolve -> time of the miss. Repeated
+# lookups of a stale or misspelled name skip the filesystem for a few seconds.
+_MISS_CACHE: "OrderedDict[str, float]" = OrderedDict()
+_MISS_CACHE_SIZE = 512
+_MISS_CACHE_TTL = 5.0
+_MISS_CACHE_LOCK = threading.Lock()
+
+# Memoized os.path.normpath: the same LoRA names are normalized over and over
+# while resolving (several spellings per name, every queue run)
+_normpath = functools.lru_cache(maxsize=4096)(os.path.normpath)
+
+# Candidate path -> (checked_at, is a regular file). Resolving the same names
+# repeatedly within a workflow run reuses the answer instead of stat'ing again.
+_STAT_CACHE: Dict[str, Tuple[float, bool]] = {}
+_STAT_CACHE_TTL = 2.0
+_STAT_CACHE_SIZE = 4096
+
+# Filesystem observer (watchdog) over the LoRA folders, started by
+# start_lora_watcher(). While it runs, create/delete/move events drop the
+# affected folder's scan and scan signatures are no longer rechecked.
+_WATCHER: Dict[str, Any] = {"observer": None, "dirs": ()}
+_WATCHER_LOCK = threading.Lock()
+# Base dir -> count of watcher events; a scan that overlapped an event is not cached
+_WATCH_EVENTS: Dict[str, int] = {}
+# Events can be missed (network shares, inotify queue overflow), so watched scans
+# still get their signatures rechecked, just rarely: base dir -> last check time
+_WATCHED_RECHECK_INTERVAL = 30.0
+_SCAN_CHECKED_AT: Dict[str, float] = {}
+
+# Identifier -> absolute path for LoRAs pinned with preload_loras(); consulted
+# before any filesystem work and trusted until cleared.
+_PRELOADED: Dict[str, str] = {}
+
+# Cached view of the LoRA folders, rebuilt only when a scan signature changes
+# Last LoRA directory list seen in folder_paths and its absolute prefixes
+_DIRS_CACHE: Dict[str, Any] = {"dirs": None, "prefixes": ()}
+
+_LORA_INDEX: Dict[str, Any] = {"key": None, "map": {}, "normalized": {}, "set": frozenset(), "list": [], "trie": {}}
+
+
+def _lora_extensions() -> Set[str]:
+    """Return the lowercase file extensions ComfyUI accepts for LoRAs."""
+    entry = (getattr(folder_paths, "folder_names_and_paths", None) or {}).get("loras")
+    if entry and len(entry) > 1 and entry[1]:
+        return {ext.lower() for ext in entry[1]}
+    supported = getattr(folder_paths, "supported_pt_extensions", None)
+    return {ext.lower() for ext in supported} if supported else set(_DEFAULT_LORA_EXTENSIONS)
+
+
+def _cached_loras_dirs() -> Tuple[str, ...]:
+    """
+    Return the configured LoRA directories.
+
+    The list is re-read from folder_paths on every call (a cheap copy) and the
+    derived prefixes are rebuilt whenever it changes, so folders registered
+    after startup (extra_model_paths, other node packs) are picked up.
+    """
+    dirs = tuple(folder_paths.get_folder_paths("loras") or [])
+    if dirs != _DIRS_CACHE["dirs"]:
+        _DIRS_CACHE["prefixes"] = tuple(
+            (base_dir, os.path.join(os.path.abspath(base_dir), "")) for base_dir in dirs
+        )
+        _DIRS_CACHE["dirs"] = dirs
+        if _is_watching():
+            start_lora_watcher()  # follow the new directory list
+    return dirs
+
+
+def _cached_lora_prefixes() -> Tuple[Tuple[str, str], ...]:
+    """
+    Return (base_dir, absolute base_dir + separator) for each LoRA directory.
+
+    Candidate paths are built by concatenating a prefix with an already
+    normalized relative name, instead of os.path.join + os.path.abspath per probe.
+    """
+    _cached_loras_dirs()
+    return _DIRS_CACHE["prefixes"]
+
+
+def _under_prefix(prefix: str, relative: str) -> str:
+    """Absolute path for a normalized relative name under a _cached_lora_prefixes prefix."""
+    if relative.startswith(".."):
+        return os.path.abspath(prefix + relative)  # climbs out of the base; normalize
+    return prefix + relative
+
+
+class _LoraDirEventHandler(FileSystemEventHandler):
+    """Invalidate the resolver caches when LoRA files or folders appear, vanish or move."""
+
+    def on_any_event(self, event) -> None:
+        if event.event_type not in ("created", "deleted", "moved"):
+            return
+        paths = [os.fsdecode(event.src_path)]
+        dest_path = getattr(event, "dest_path", None)
+        if dest_path:
+            paths.append(os.fsdecode(dest_path))
+        if not event.is_directory:
+            extensions = _lora_extensions()
+            if extensions and not any(os.path.splitext(path)[1].lower() in extensions for path in paths):
+                return
+        _invalidate_paths(paths)
+
+
+def _invalidate_paths(paths: Iterable[str]) -> None:
+    """Drop the scans of the LoRA folders holding paths, plus cached stats and misses."""
+    for base_dir in _WATCHER["dirs"]:
+        root = os.path.join(os.path.abspath(base_dir), "")
+        if any(os.path.abspath(path).startswith(root) for path in paths):
+            _WATCH_EVENTS[base_dir] = _WATCH_EVENTS.get(base_dir, 0) + 1
+            _SCAN_CACHE.pop(base_dir, None)
+    _STAT_CACHE.clear()
+    with _MISS_CACHE_LOCK:
+        _MISS_CACHE.clear()
+
+
+def start_lora_watcher() -> bool:
+    """
+    Watch the LoRA folders for changes (requires the optional watchdog package).
+
+    Called once the server is up; call again after the LoRA folders change.
+
+    Returns:
+        True if an observer is running, False when falling back to mtime checks
+    """
+    if Observer is None or not COMFYUI_AVAILABLE or folder_paths is None:
+        return False
+    try:
+        dirs = _cached_loras_dirs()
+    except Exception:
+        return False
+    with _WATCHER_LOCK:
+        if _WATCHER["observer"] is not None and _WATCHER["dirs"] == dirs:
+            return True
+        _stop_watching_locked()
+        try:
+            observer = Observer()
+            handler = _LoraDirEventHandler()
+            for base_dir in dirs:
+                if os.path.isdir(base_dir):
+                    observer.schedule(handler, base_dir, recursive=True)
+            observer.daemon = True
+            observer.start()
+        except Exception as e:
+            print(f"Super LoRA Loader: Could not watch LoRA folders, using mtime checks: {e}")
+            return False
+        # Scans taken before the observer started may already be stale
+        _SCAN_CACHE.clear()
+        _WATCHER["observer"] = observer
+        _WATCHER["dirs"] = dirs
+        return True
+
+
+def _stop_watching_locked() -> None:
+    observer = _WATCHER["observer"]
+    _WATCHER["observer"] = None
+    _WATCHER["dirs"] = ()
+    if observer is not None:
+        try:
+            observer.stop()
+        except Exception:
+            pass
+
+
+def _is_watching() -> bool:
+    return _WATCHER["observer"] is not None
+
+
+def invalidate_dir_cache() -> None:
+    """Forget the cached LoRA directory list and lookups (e.g. after extra model paths change)."""
+    _DIRS_CACHE["dirs"] = None
+    _DIRS_CACHE["prefixes"] = ()
+    # Rescan everything too: with the watcher running, a missed event would
+    # otherwise keep a stale scan until restart
+    _SCAN_CACHE.clear()
+    _LORA_INDEX["key"] = None
+    _STAT_CACHE.clear()
+    _PRELOADED.clear()
+    with _MISS_CACHE_LOCK:
+        _MISS_CACHE.clear()
+
+
+def _is_file(path: str) -> bool:
+    """os.path.isfile with the answer cached for _STAT_CACHE_TTL seconds."""
+    now = time.monotonic()
+    cached = _STAT_CACHE.get(path)
+    if cached is not None and now - cached[0] < _STAT_CACHE_TTL:
+        return cached[1]
+    try:
+        # Follows symlinks on purpose: a symlinked LoRA file is still a LoRA
+        result = stat.S_ISREG(os.stat(path).st_mode)
+    except (OSError, ValueError):
+        result = False
+    if len(_STAT_CACHE) >= _STAT_CACHE_SIZE:
+        _STAT_CACHE.clear()
+    _STAT_CACHE[path] = (now, result)
+    return result
+
+
+def _recent_miss(lora_identifier: str) -> bool:
+    """Return True if lora_identifier failed to resolve within the last _MISS_CACHE_TTL seconds."""
+    with _MISS_CACHE_LOCK:
+        missed_at = _MISS_CACHE.get(lora_identifier)
+        if missed_at is None:
+            return False
+        if time.monotonic() - missed_at < _MISS_CACHE_TTL:
+            return True
+        del _MISS_CACHE[lora_identifier]
+        return False
+
+
+def _remember_miss(lora_identifier: str) -> None:
+    with _MISS_CACHE_LOCK:
+        _MISS_CACHE[lora_identifier] = time.monotonic()
+        _MISS_CACHE.move_to_end(lora_identifier)
+        while len(_MISS_CACHE) > _MISS_CACHE_SIZE:
+            _MISS_CACHE.popitem(last=False)
+
+
+def _signature_is_current(signature: Tuple[Tuple[str, int], ...]) -> bool:
+    """Check whether every directory recorded in a scan signature is unchanged."""
+    for path, mtime_ns in signature:
+        try:
+            if os.stat(path).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def _scan_lora_dir(base_dir: str, extensions: Set[str]) -> Tuple[Tuple[Tuple[str, int], ...], List[str]]:
+    """
+    Walk a LoRA directory with os.scandir.
+
+    Returns the scan signature and the matching files relative to base_dir,
+    using os.sep like folder_paths.get_filename_list.
+    """
+    signature: List[Tuple[str, int]] = []
+    files: List[str] = []
+    # Hot loop for large collections: bind lookups once and take the extension
+    # with rpartition (same result as os.path.splitext, without the call chain)
+    add_file = files.append
+    scandir = os.scandir
+    sep = os.sep
+    stack = [(base_dir, "")]
+    push = stack.append
+    while stack:
+        current, prefix = stack.pop()
+        try:
+            signature.append((current, os.stat(current).st_mtime_ns))
+            with scandir(current) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if entry.is_dir():
+                        if name not in _EXCLUDED_DIR_NAMES:
+                            push((entry.path, prefix + name + sep))
+                        continue
+                    if extensions:
+                        stem, dot, suffix = name.rpartition(".")
+                        if not (dot and stem.lstrip(".")) or ("." + suffix).lower() not in extensions:
+                            continue
+                    add_file(prefix + name)
+        except OSError:
+            continue
+    return tuple(signature), files
+
+
+def _scanned_dir(base_dir: str, validate: bool = True) -> Tuple[Tuple[Tuple[str, int], ...], List[str], FrozenSet[str]]:
+    """
+    Return the _SCAN_CACHE entry for a LoRA directory, scanning it if needed.
+
+    With validate=False an existing entry is returned without checking its
+    signature; callers must confirm any hit against the filesystem.
+    """
+    cached = _SCAN_CACHE.get(base_dir)
+    watching = _is_watching()
+    if validate and cached is not None and watching:
+        # The watcher's events drop stale scans; only recheck signatures occasionally
+        now = time.monotonic()
+        if now - _SCAN_CHECKED_AT.get(base_dir, 0.0) < _WATCHED_RECHECK_INTERVAL:
+            validate = False
+        else:
+            _SCAN_CHECKED_AT[base_dir] = now
+    if cached is None or (validate and not _signature_is_current(cached[0])):
+        if cached is not None:
+            # The folder changed, so cached isfile answers for it may be stale too
+            _STAT_CACHE.clear()
+        events = _WATCH_EVENTS.get(base_dir, 0)
+        signature, files = _scan_lora_dir(base_dir, _lora_extensions())
+        cached = (signature, files, frozenset(files))
+        if not watching or _WATCH_EVENTS.get(base_dir, 0) == events:
+            _SCAN_CACHE[base_dir] = cached
+            _SCAN_CHECKED_AT[base_dir] = time.monotonic()
+    return cached
+
+
+def _normalize_lora_key(name: str) -> str:
+    """Separator- and case-insensitive lookup key for a LoRA relative path."""
+    return _normpath(name).replace("\\", "/").lower()
+
+
+def _get_lora_index(validate: bool = True) -> Dict[str, Any]:
+    """
+    Return the cached LoRA filename index.
+
+    Each LoRA directory is only rescanned when its signature is stale; the
+    sorted filename list, its exact-match set and the lowercase and
+    normalized lookup maps are rebuilt only when a directory was rescanned or
+    the configured directories changed. validate=False skips the signature
+    checks for directories that are already scanned.
+    """
+    dirs = _cached_loras_dirs()
+    scans = [_scanned_dir(base_dir, validate) for base_dir in dirs]
+
+    key = (dirs, tuple(scan[0] for scan in scans))
+    if key != _LORA_INDEX["key"]:
+        names: Set[str] = set()
+        for scan in scans:
+            names.update(scan[1])
+        lora_list = sorted(names)
+        _LORA_INDEX["list"] = lora_list
+        _LORA_INDEX["set"] = frozenset(lora_list)
+        _LORA_INDEX["map"] = {_same_or(p.lower(), p): p for p in lora_list}
+        _LORA_INDEX["normalized"] = {_same_or(_normalize_lora_key(p), p): p for p in lora_list}
+        _LORA_INDEX["trie"] = _build_lora_trie(lora_list)
+        _LORA_INDEX["key"] = key
+    return _LORA_INDEX
+
+
+def _same_or(key: str, name: str) -> str:
+    """Return name itself when key is an equal copy, so the index stores one string object."""
+    return name if key == name else key
+
+
+def _split_lora_path(name: str) -> List[str]:
+    """Split a relative LoRA path into its folder/file components (either separator)."""
+    return [part for part in name.replace("\\", "/").split("/") if part]
+
+
+def _build_lora_trie(lora_list: List[str]) -> Dict[Optional[str], Any]:
+    """
+    Build a folder tree over the LoRA names.
+
+    Each node maps a path component to its child node; the None key of a node
+    holds the full name of the LoRA ending there. Components are interned, so
+    a folder name repeated across thousands of entries is stored once.
+    """
+    trie: Dict[Optional[str], Any] = {}
+    intern = sys.intern
+    for name in lora_list:
+        node = trie
+        for part in _split_lora_path(name):
+            node = node.setdefault(intern(part), {})
+        node[None] = name
+    return trie
+
+
+def prefix_match(prefix: str) -> List[str]:
+    """
+    List the LoRAs stored under a folder prefix.
+
+    Args:
+        prefix: Relative folder such as "Qwen" or "Qwen/anime" ("" for all)
+
+    Returns:
+        Sorted LoRA names under that folder, or [] if there are none
+    """
+    if not COMFYUI_AVAILABLE or folder_paths is None:
+        return []
+
+    try:
+        node = _get_lora_index()["trie"]
+        for part in _split_lora_path(prefix or ""):
+            node = node.get(part)
+            if node is None:
+                return []
+        names: List[str] = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            for part, child in current.items():
+                if part is None:
+                    names.append(child)
+                else:
+                    stack.append(child)
+        return sorted(names)
+    except Exception as e:
+        print(f"Super LoRA Loader: Error matching LoRA prefix '{prefix}': {e}")
+        return []
+
 
 def get_lora_by_filename(filename: str) -> Optional[str]:
     """
@@ -33,18 +459,17 @@ def get_lora_by_filename(filename: str) -> Optional[str]:
         return None
         
     try:
-        lora_paths = folder_paths.get_filename_list("loras")
-        
+        idx = _get_lora_index()
+
         # Try exact match first
-        if filename in lora_paths:
+        if filename in idx["set"]:
             return filename
-            
+
         # Try case-insensitive match
-        filename_lower = filename.lower()
-        for lora_path in lora_paths:
-            if lora_path.lower() == filename_lower:
-                return lora_path
-                
+        lora_path = idx["map"].get(filename.lower())
+        if lora_path:
+            return lora_path
+
         print(f"Super LoRA Loader: LoRA file '{filename}' not found")
         return None
     except Exception as e:
@@ -52,6 +477,77 @@ def get_lora_by_filename(filename: str) -> Optional[str]:
         return None
 
 
+def _candidate_keys(lora_identifier: str) -> List[str]:
+    """Spellings of an identifier to probe (original, normed, forward/backward slashes)."""
+    candidates: List[str] = []
+    seen: Set[str] = set()
+    raw_variants = [
+        lora_identifier,
+        _normpath(lora_identifier),
+        _normpath(lora_identifier).lstrip("\\/"),
+    ]
+    for variant in raw_variants:
+        if not variant:
+            continue
+        for key in {variant, variant.replace("\\", "/"), variant.replace("/", os.sep)}:
+            if key and key not in seen:
+                candidates.append(key)
+                seen.add(key)
+    return candidates
+
+
+def _relative_candidates(candidates: List[str]) -> List[str]:
+    """Normalized relative candidates, in the os.sep form the directory indexes use."""
+    return list(dict.fromkeys(
+        _normpath(candidate) for candidate in candidates if not os.path.isabs(candidate)
+    ))
+
+
+def _probe_dir_indexes(
+    relative_candidates: List[str], lora_prefixes: Iterable[Tuple[str, str]], validate: bool
+) -> Optional[str]:
+    """Return the first indexed candidate that still exists on disk, honouring directory order."""
+    for base_dir, prefix in lora_prefixes:
+        indexed = _scanned_dir(base_dir, validate)[2]
+        for candidate in relative_candidates:
+            if candidate in indexed:
+                candidate_path = _under_prefix(prefix, candidate)
+                if _is_file(candidate_path):
+                    return candidate_path
+    return None
+
+
+def _preloaded_path(lora_identifier: str) -> Optional[str]:
+    """Return the preloaded absolute path for an identifier, if any."""
+    if not _PRELOADED:
+        return None
+    found = _PRELOADED.get(lora_identifier)
+    if found is None and "\\" in lora_identifier:
+        found = _PRELOADED.get(lora_identifier.replace("\\", "/"))
+    return found
+
+
+def preload_loras(lora_identifiers: Iterable[str]) -> None:
+    """
+    Resolve a set of LoRAs once and pin their paths for fast switching.
+
+    Later resolve_lora_full_path calls for these identifiers return the stored
+    path without touching the filesystem. Names that do not resolve are skipped.
+    Entries stay until clear_preloaded_loras() or invalidate_dir_cache().
+
+    Args:
+        lora_identifiers: Filenames (relative to loras dir) or absolute paths
+    """
+    for name, full_path in resolve_lora_full_paths(lora_identifiers).items():
+        if full_path:
+            _PRELOADED[name.replace("\\", "/")] = full_path
+
+
+def clear_preloaded_loras() -> None:
+    """Drop every path pinned by preload_loras()."""
+    _PRELOADED.clear()
+
+
 def resolve_lora_full_path(lora_identifier: str) -> Optional[str]:
     """
     Resolve a LoRA identifier (filename or absolute path) to an absolute path.
@@ -63,38 +559,60 @@ def resolve_lora_full_path(lora_identifier: str) -> Optional[str]:
 
     This helper respects additional directories declared through extra_model_paths.
     """
+    return _resolve_lora_full_path(lora_identifier, True)
+
+
+def _resolve_lora_full_path(lora_identifier: str, validate: bool) -> Optional[str]:
+    """
+    resolve_lora_full_path; with validate=False the directory indexes are used
+    without rechecking their signatures (the caller has just validated them).
+    """
     try:
         if not lora_identifier or lora_identifier == "None":
             return None
 
-        # If already an absolute path, validate and return.
+        preloaded = _preloaded_path(lora_identifier)
+        if preloaded:
+            return preloaded
+
+        # If already an absolute path to a file, return it without consulting
+        # the LoRA folders at all.
         if os.path.isabs(lora_identifier):
-            abs_candidate = os.path.normpath(lora_identifier)
-            if os.path.exists(abs_candidate):
+            abs_candidate = _normpath(lora_identifier)
+            if _is_file(abs_candidate):
                 return abs_candidate
 
+        if _recent_miss(lora_identifier):
+            return None
+
         if not COMFYUI_AVAILABLE or folder_paths is None:
             return None
 
-        def _normalized(key: str) -> str:
-            return os.path.normpath(key).replace("\\", "/").lower()
-
-        # Build list of candidate keys to probe (original, normed, forward/backward slashes).
-        candidates: List[str] = []
-        seen: Set[str] = set()
-        raw_variants = [
-            lora_identifier,
-            os.path.normpath(lora_identifier),
-            os.path.normpath(lora_identifier).lstrip("\\/"),
-        ]
-        for variant in raw_variants:
-            if not variant:
-                continue
-            for key in {variant, variant.replace("\\", "/"), variant.replace("/", os.sep)}:
-                if key and key not in seen:
-                    candidates.append(key)
-                    seen.add(key)
+        candidates = _candidate_keys(lora_identifier)
+        lora_prefixes = _cached_lora_prefixes()
+
+        # Probe the scanned directory indexes first: set membership instead of a
+        # stat per (directory, candidate). The cached sets are tried as-is, then
+        # revalidated once.
+        relative_candidates = _relative_candidates(candidates)
+        for revalidate in ((False, True) if validate else (False,)):
+            found = _probe_dir_indexes(relative_candidates, lora_prefixes, revalidate)
+            if found:
+                return found
+
+        # Direct join for each base dir and candidate (covers case-insensitive
+        # filesystems and files outside the LoRA extension list). A proven
+        # candidate is returned as-is; get_full_path would only walk the same
+        # base dirs again.
+        for _, prefix in lora_prefixes:
+            for candidate in candidates:
+                if os.path.isabs(candidate):
+                    continue
+                candidate_path = _under_prefix(prefix, _normpath(candidate))
+                if _is_file(candidate_path):
+                    return candidate_path
 
+        # Legacy fallback: let ComfyUI resolve names our own probes could not
         get_full_path = getattr(folder_paths, "get_full_path", None)
         if callable(get_full_path):
             for candidate in candidates:
@@ -102,51 +620,120 @@ def resolve_lora_full_path(lora_identifier: str) -> Optional[str]:
                     resolved = get_full_path("loras", candidate)
                 except Exception:
                     resolved = None
-                if resolved and os.path.exists(resolved):
+                if resolved and _is_file(resolved):
                     return os.path.abspath(resolved)
 
-        lora_dirs = folder_paths.get_folder_paths("loras") or []
-        # Direct join for each base dir and candidate
-        for base_dir in lora_dirs:
-            for candidate in candidates:
-                if os.path.isabs(candidate):
-                    continue
-                candidate_path = os.path.join(base_dir, os.path.normpath(candidate))
-                if os.path.exists(candidate_path):
-                    return os.path.abspath(candidate_path)
-
-        # Case-insensitive lookup via filename list
-        try:
-            available = folder_paths.get_filename_list("loras")
-        except Exception:
-            available = []
-
-        lookup_map = {_normalized(item): item for item in available}
+        # Case-insensitive lookup via the normalized index (built once per scan
+        # change, not per call)
+        lookup_map = _get_lora_index(validate)["normalized"]
         for candidate in candidates:
-            key = _normalized(candidate)
+            key = _normalize_lora_key(candidate)
             match = lookup_map.get(key)
             if not match:
                 continue
-            resolved = None
+            for _, prefix in lora_prefixes:
+                candidate_path = _under_prefix(prefix, _normpath(match))
+                if _is_file(candidate_path):
+                    return candidate_path
             if callable(get_full_path):
                 try:
                     resolved = get_full_path("loras", match)
                 except Exception:
                     resolved = None
-            if not resolved:
-                for base_dir in lora_dirs:
-                    candidate_path = os.path.join(base_dir, os.path.normpath(match))
-                    if os.path.exists(candidate_path):
-                        resolved = candidate_path
-                        break
-            if resolved and os.path.exists(resolved):
-                return os.path.abspath(resolved)
+                if resolved and _is_file(resolved):
+                    return os.path.abspath(resolved)
 
+        _remember_miss(lora_identifier)
         return None
     except Exception:
         return None
 
 
+def resolve_lora_full_paths(lora_identifiers: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    Resolve several LoRA identifiers at once.
+
+    The directory indexes are looked up (and, if anything misses, revalidated)
+    once for the whole batch instead of once per name; names that are not in
+    any index go through resolve_lora_full_path's slower fallbacks against the
+    indexes already validated here.
+
+    Args:
+        lora_identifiers: Filenames (relative to loras dir) or absolute paths
+
+    Returns:
+        Dict mapping each identifier to its absolute path, or None if not found
+    """
+    names = list(dict.fromkeys(lora_identifiers))
+    results: Dict[str, Optional[str]] = {}
+    pending: Dict[str, List[str]] = {}
+
+    lora_prefixes: Tuple[Tuple[str, str], ...] = ()
+    if COMFYUI_AVAILABLE and folder_paths is not None:
+        try:
+            lora_prefixes = _cached_lora_prefixes()
+        except Exception:
+            lora_prefixes = ()
+
+    for name in names:
+        preloaded = _preloaded_path(name) if name else None
+        if preloaded:
+            results[name] = preloaded
+            continue
+        if not lora_prefixes or not name or name == "None" or os.path.isabs(name) or _recent_miss(name):
+            continue
+        pending[name] = _relative_candidates(_candidate_keys(name))
+
+    validated = False
+    try:
+        for validate in (False, True):
+            if not pending:
+                break
+            if validate:
+                for base_dir, _ in lora_prefixes:
+                    _scanned_dir(base_dir, True)
+                validated = True
+            for name, relative_candidates in list(pending.items()):
+                found = _probe_dir_indexes(relative_candidates, lora_prefixes, False)
+                if found:
+                    results[name] = found
+                    del pending[name]
+    except Exception:
+        pass
+
+    leftovers = [name for name in names if name not in results]
+    if leftovers and lora_prefixes and not validated:
+        try:
+            for base_dir, _ in lora_prefixes:
+                _scanned_dir(base_dir, True)
+            validated = True
+        except Exception:
+            pass
+    for name in leftovers:
+        results[name] = _resolve_lora_full_path(name, not validated)
+    return {name: results[name] for name in names}
+
+
+def _read_safetensors_metadata(full_path: str) -> Dict[str, Any]:
+    """
+    Read the __metadata__ block of a safetensors file without loading tensors.
+
+    The format starts with an 8-byte little-endian header length followed by a
+    JSON header, so this needs neither the safetensors package nor torch.
+    Non-safetensors files (e.g. .pt/.ckpt) yield an empty dict.
+    """
+    try:
+        with open(full_path, "rb") as f:
+            header_len = int.from_bytes(f.read(8), "little")
+            if header_len <= 0 or header_len > _MAX_SAFETENSORS_HEADER:
+                return {}
+            header = json.loads(f.read(header_len))
+        metadata = header.get("__metadata__") if isinstance(header, dict) else None
+        return metadata if isinstance(metadata, dict) else {}
+    except Exception:
+        return {}
+
+
 def extract_trigger_words(lora_identifier: str, max_words: int = 3) -> List[str]:
     """
     Extract trigger words from LoRA metadata (e.g., Kohya ss_tag_frequency or ss_trained_words) in safetensors.
@@ -161,111 +748,138 @@ def extract_trigger_words(lora_identifier: str, max_words: int = 3) -> List[str]
     try:
         # Resolve to a full path within ComfyUI loras directory
         full_path = resolve_lora_full_path(lora_identifier)
-        if not full_path or not os.path.exists(full_path):
+        if not full_path:
             return []
-
-        # Use safetensors to read metadata when available
         try:
-            from safetensors import safe_open  # type: ignore
-        except Exception:
-            safe_open = None
+            st = os.stat(full_path)
+        except OSError:
+            return []
 
-        metadata: Dict[str, Any] = {}
-        if safe_open is not None:
-            try:
-                with safe_open(full_path, framework="pt", device="cpu") as f:
-                    metadata = f.metadata() or {}
-            except Exception:
-                metadata = {}
+        return list(_extract_trigger_words_cached(full_path, st.st_mtime_ns, st.st_size, max_words))
+    except Exception as e:
+        print(f"Super LoRA Loader: Error extracting trigger words: {e}")
+        return []
+
+
+def extract_trigger_words_many(lora_identifiers: Iterable[str], max_words: int = 3) -> Dict[str, List[str]]:
+    """
+    Extract trigger words for several LoRAs at once.
+
+    Metadata reads are blocking file I/O, so they are spread over a small
+    thread pool instead of being issued one file after another.
+
+    Args:
+        lora_identifiers: Filenames (relative to loras dir) or absolute paths
+        max_words: Maximum number of trigger words to extract per LoRA
+
+    Returns:
+        Dict mapping each identifier to its list of trigger words
+    """
+    names = list(dict.fromkeys(name for name in lora_identifiers if name))
+    if len(names) <= 1:
+        return {name: extract_trigger_words(name, max_words) for name in names}
+
+    with ThreadPoolExecutor(max_workers=min(_TRIGGER_WORD_WORKERS, len(names))) as pool:
+        results = pool.map(lambda name: extract_trigger_words(name, max_words), names)
+        return dict(zip(names, results))
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_trigger_words_cached(full_path: str, mtime_ns: int, size: int, max_words: int) -> Tuple[str, ...]:
+    """
+    Read trigger words for an already-resolved LoRA file.
+
+    mtime_ns and size are only part of the cache key: a modified file gets a
+    fresh entry, while files without usable metadata are cached as empty.
+    """
+    metadata = _read_safetensors_metadata(full_path)
+
+    words: List[str] = []
 
-        words: List[str] = []
+    # 1) Kohya metadata: ss_tag_frequency (JSON string)
+    tag_freq = metadata.get("ss_tag_frequency") if metadata else None
+    if isinstance(tag_freq, str):
+        try:
+            parsed = json.loads(tag_freq)
+            # parsed may be a dict[tag]->count or nested dict; walk it with an
+            # explicit stack of iterators so deep maps can't hit the recursion limit
+            flat: Counter = Counter()
+            stack = [iter(((None, parsed),))]
+            while stack:
+                for key, value in stack[-1]:
+                    if isinstance(value, (int, float)):
+                        if key is not None and str(key).strip():
+                            flat[key] += value
+                    elif isinstance(value, dict):
+                        stack.append(iter(value.items()))
+                        break
+                    elif isinstance(value, list):
+                        stack.append((None, item) for item in value)
+                        break
+                else:
+                    stack.pop()
+            for tag, _ in flat.most_common(max_words):
+                words.append(str(tag).strip())
+        except Exception:
+            pass
 
-        # 1) Kohya metadata: ss_tag_frequency (JSON string)
-        tag_freq = metadata.get("ss_tag_frequency") if metadata else None
-        if isinstance(tag_freq, str):
+    # 2) Kohya metadata: ss_trained_words (string or JSON list)
+    if not words:
+        trained = metadata.get("ss_trained_words") if metadata else None
+        if isinstance(trained, str):
+            # Try JSON first
+            parsed_list: Optional[List[str]] = None
             try:
-                parsed = json.loads(tag_freq)
-                # parsed may be a dict[tag]->count or nested dict
-                flat: Dict[str, float] = {}
-                def add_counts(obj: Any):
-                    if isinstance(obj, dict):
-                        for k, v in obj.items():
-                            if isinstance(v, (int, float)):
-                                flat[k] = flat.get(k, 0) + float(v)
-                            else:
-                                add_counts(v)
-                    elif isinstance(obj, list):
-                        for it in obj:
-                            add_counts(it)
-                add_counts(parsed)
-                if flat:
-                    sorted_tags = sorted(flat.items(), key=lambda kv: kv[1], reverse=True)
-                    for tag, _ in sorted_tags:
-                        t = str(tag).strip()
-                        if t:
-                            words.append(t)
-                            if len(words) >= max_words:
-                                break
+                maybe = json.loads(trained)
+                if isinstance(maybe, list):
+                    parsed_list = [str(x).strip() for x in maybe if str(x).strip()]
             except Exception:
                 pass
+            if parsed_list:
+                words.extend(parsed_list[:max_words])
+            else:
+                # Fallback: split by commas or whitespace
+                tokens = [t.strip() for t in trained.replace("\n", " ").split(",")]
+                tokens = [t for tt in tokens for t in tt.split()]
+                tokens = [t for t in tokens if t]
+                if tokens:
+                    words.extend(tokens[:max_words])
+        elif isinstance(trained, list):
+            tokens = [str(x).strip() for x in trained if str(x).strip()]
+            words.extend(tokens[:max_words])
 
-        # 2) Kohya metadata: ss_trained_words (string or JSON list)
-        if not words:
-            trained = metadata.get("ss_trained_words") if metadata else None
-            if isinstance(trained, str):
-                # Try JSON first
-                parsed_list: Optional[List[str]] = None
+    # 3) Any other metadata keys containing 'trainedWords' or 'trigger'
+    if not words and metadata:
+        for key, val in metadata.items():
+            if key in _KOHYA_METADATA_KEYS:
+                continue
+            lk = str(key).lower()
+            if "trainedwords" not in lk and "trigger" not in lk:
+                continue
+            if isinstance(val, str):
                 try:
-                    maybe = json.loads(trained)
+                    maybe = json.loads(val)
                     if isinstance(maybe, list):
-                        parsed_list = [str(x).strip() for x in maybe if str(x).strip()]
+                        words.extend([str(x).strip() for x in maybe if str(x).strip()])
+                    elif isinstance(maybe, str):
+                        words.append(maybe.strip())
                 except Exception:
-                    pass
-                if parsed_list:
-                    words.extend(parsed_list[:max_words])
-                else:
-                    # Fallback: split by commas or whitespace
-                    tokens = [t.strip() for t in trained.replace("\n", " ").split(",")]
-                    tokens = [t for tt in tokens for t in tt.split()]
-                    tokens = [t for t in tokens if t]
-                    if tokens:
-                        words.extend(tokens[:max_words])
-            elif isinstance(trained, list):
-                tokens = [str(x).strip() for x in trained if str(x).strip()]
-                words.extend(tokens[:max_words])
-
-        # 3) Any other metadata keys containing 'trainedWords' or 'trigger'
-        if not words and metadata:
-            for key, val in metadata.items():
-                lk = str(key).lower()
-                if "trainedwords" in lk or "trigger" in lk:
-                    if isinstance(val, str):
-                        try:
-                            maybe = json.loads(val)
-                            if isinstance(maybe, list):
-                                words.extend([str(x).strip() for x in maybe if str(x).strip()])
-                            elif isinstance(maybe, str):
-                                words.append(maybe.strip())
-                        except Exception:
-                            for token in [t.strip() for t in val.replace("\n", " ").split(",")]:
-                                if token:
-                                    words.append(token)
-                    elif isinstance(val, list):
-                        words.extend([str(x).strip() for x in val if str(x).strip()])
-                if len(words) >= max_words:
-                    break
-
-        # Deduplicate and clamp
-        out: List[str] = []
-        for w in words:
-            if w and w not in out:
-                out.append(w)
-            if len(out) >= max_words:
+                    for token in [t.strip() for t in val.replace("\n", " ").split(",")]:
+                        if token:
+                            words.append(token)
+            elif isinstance(val, list):
+                words.extend([str(x).strip() for x in val if str(x).strip()])
+            if len(words) >= max_words:
                 break
-        return out
-    except Exception as e:
-        print(f"Super LoRA Loader: Error extracting trigger words: {e}")
-        return []
+
+    # Deduplicate and clamp
+    out: List[str] = []
+    for w in words:
+        if w and w not in out:
+            out.append(w)
+        if len(out) >= max_words:
+            break
+    return tuple(out)
 
 
 def get_available_loras() -> List[str]:
@@ -280,7 +894,7 @@ def get_available_loras() -> List[str]:
         return []
         
     try:
-        return folder_paths.get_filename_list("loras")
+        return list(_get_lora_index()["list"])
     except Exception as e:
         print(f"Super LoRA Loader: Error getting LoRA list: {e}")
         return []
@@ -306,10 +920,14 @@ def validate_lora_config(config: dict) -> bool:
     strength_model = config.get('strength_model', 1.0)
     strength_clip = config.get('strength_clip', strength_model)
     
-    try:
-        float(strength_model)
-        float(strength_clip)
-    except (ValueError, TypeError):
+    if not (_is_numeric(strength_model) and _is_numeric(strength_clip)):
         return False
-        
+
     return True
+
+
+def _is_numeric(value: Any) -> bool:
+    """Return True for numbers and numeric strings (e.g. "0.8", "-1e-2")."""
+    if isinstance(value, (int, float)):
+        return True
+    return isinstance(value, str) and _FLOAT_RE.match(value) is not None
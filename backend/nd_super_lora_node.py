@@ -2,32 +2,87 @@
 ND Super LoRA Loader Node - Main implementation
 """
 
-from typing import Union, Dict, Any, Tuple, List
-import re
-import json
-
-# Import ComfyUI modules with fallbacks
-try:
-    import folder_paths
-    from nodes import LoraLoader
-    COMFYUI_AVAILABLE = True
-except ImportError:
-    print("ND Super Nodes: ComfyUI modules not available (this is normal during development)")
-    folder_paths = None
-    LoraLoader = None
-    COMFYUI_AVAILABLE = False
+from typing import Union, Dict, Any, Optional, Tuple, List
+import importlib
+import logging
 
 # Import local modules
 try:
-    from .lora_utils import get_lora_by_filename, extract_trigger_words
-    from .civitai_service import CivitAiService, get_civitai_service
+    from .lora_utils import get_lora_by_filename
+    from .json_utils import loads as json_loads
 except ImportError:
     # Fallback for development/testing
     import sys
     import os
     sys.path.append(os.path.dirname(__file__))
-    from lora_utils import get_lora_by_filename, extract_trigger_words
-    from civitai_service import CivitAiService, get_civitai_service
+    from lora_utils import get_lora_by_filename
+    from json_utils import loads as json_loads
+
+# Per-execution trace output; enable with logging.getLogger("nd_super_nodes").setLevel(logging.DEBUG)
+logger = logging.getLogger("nd_super_nodes.lora_loader")
+
+# ComfyUI modules are imported on the first load_loras call rather than at import
+_COMFY_MODULES: Dict[str, Any] = {}
+
+
+def _get_lora_loader() -> Optional[Any]:
+    """
+    Return a new ComfyUI LoraLoader, or None outside ComfyUI.
+
+    Callers create one per load_loras run and drop it afterwards: a loader keeps
+    the last LoRA it read, which must not outlive the run (or ComfyUI's
+    free-memory pass) in a module-level cache.
+    """
+    if "nodes" not in _COMFY_MODULES:
+        try:
+            _COMFY_MODULES["nodes"] = importlib.import_module("nodes")
+        except ImportError:
+            _COMFY_MODULES["nodes"] = None
+    nodes = _COMFY_MODULES["nodes"]
+    lora_loader_class = getattr(nodes, "LoraLoader", None) if nodes is not None else None
+    if lora_loader_class is None:
+        print("ND Super Nodes: ComfyUI modules not available (this is normal during development)")
+        return None
+    return lora_loader_class()
+
+# Config field -> accepted keys in the frontend bundle, in priority order
+_FIELD_ALIASES = {
+    "enabled": ("enabled", "on"),
+    "lora": ("lora",),
+    "strength": ("strength",),
+    "strength_clip": ("strengthClip", "strengthTwo"),
+    "trigger_words": ("triggerWords", "triggerWord"),
+}
+
+
+def _pick_field(config: Dict[str, Any], field: str, default: Any = None) -> Any:
+    """Return the first non-empty value among a field's aliases, or default."""
+    for key in _FIELD_ALIASES[field]:
+        value = config.get(key)
+        if value is not None and value != "":
+            return value
+    return default
+
+
+def _trigger_text(value: Any) -> str:
+    """Trigger words as one string; list values from the frontend are joined with ", "."""
+    if isinstance(value, (list, tuple)):
+        return ", ".join(word.strip() for word in value if isinstance(word, str) and word.strip())
+    if isinstance(value, str):
+        return value.strip()
+    return ""
+
+
+def _active_configs(lora_configs: List[Any]) -> List[Tuple[str, Dict[str, Any]]]:
+    """Return (lora_name, config) for enabled configs that name a LoRA, skipping everything else up front."""
+    active: List[Tuple[str, Dict[str, Any]]] = []
+    for config in lora_configs:
+        if not isinstance(config, dict) or not _pick_field(config, "enabled", False):
+            continue
+        lora_name = _pick_field(config, "lora", "None")
+        if lora_name != "None":
+            active.append((lora_name, config))
+    return active
 
 
 class NdSuperLoraLoader:
@@ -47,30 +102,37 @@ class NdSuperLoraLoader:
     RETURN_TYPES = ("MODEL", "CLIP", "STRING")
     RETURN_NAMES = ("MODEL", "CLIP", "TRIGGER_WORDS")
     FUNCTION = "load_loras"
-    
+
+    # INPUT_TYPES is static; build it once since ComfyUI queries it on every object_info/validation
+    _INPUT_TYPES_CACHE = None
+
     @classmethod
     def INPUT_TYPES(cls):
-        return {
-            "required": {
-                "model": ("MODEL",),
-            },
-            "optional": {
-                "clip": ("CLIP",),
-                # Frontend will provide a JSON array of lora configs here
-                "lora_bundle": ("STRING",),
-            },
-            "hidden": {}
-        }
+        if cls._INPUT_TYPES_CACHE is None:
+            cls._INPUT_TYPES_CACHE = {
+                "required": {
+                    "model": ("MODEL",),
+                },
+                "optional": {
+                    "clip": ("CLIP",),
+                    # Frontend will provide a JSON array of lora configs here
+                    "lora_bundle": ("STRING",),
+                },
+                "hidden": {}
+            }
+        return cls._INPUT_TYPES_CACHE
     
     def load_loras(self, model, clip=None, lora_bundle: Union[str, None] = None, **kwargs) -> Tuple[Any, Any, str]:
         """
         Load multiple LoRAs from provided bundle and return modified model, clip, and trigger words.
         """
-        if not COMFYUI_AVAILABLE:
+        lora_loader = _get_lora_loader()
+        if lora_loader is None:
             print("Super LoRA Loader: ComfyUI not available, cannot load LoRAs")
             return (model, clip, "")  # Return model unchanged
 
-        trigger_words: List[str] = []
+        # Ordered set of trigger words; stacked LoRAs often repeat the same triggers
+        trigger_words: Dict[str, None] = {}
         current_model = model
         current_clip = clip
 
@@ -78,42 +140,34 @@ class NdSuperLoraLoader:
             print("Super LoRA Loader: No model provided; returning unchanged")
             return (None, current_clip, "")
 
-        print("--- Super LoRA Loader Backend ---")
-        print(f"Received lora_bundle length: {len(lora_bundle) if isinstance(lora_bundle, str) else 'None'}")
+        logger.debug(
+            "Received lora_bundle length: %s",
+            len(lora_bundle) if isinstance(lora_bundle, str) else "None",
+        )
 
         # Parse lora configs from the bundle (JSON array)
         lora_configs: List[Dict[str, Any]] = []
-        if isinstance(lora_bundle, str) and lora_bundle.strip():
-            try:
-                parsed = json.loads(lora_bundle)
-                if isinstance(parsed, list):
-                    lora_configs = parsed
-                else:
-                    print("Super LoRA Loader: lora_bundle is not a list; ignoring")
-            except json.JSONDecodeError as e:
-                print(f"Super LoRA Loader: Failed to parse lora_bundle JSON: {e}")
+        bundle = lora_bundle.strip() if isinstance(lora_bundle, str) else ""
+        if bundle:
+            # Only a JSON array is meaningful; skip the parser for anything else
+            if bundle[0] != "[":
+                print("Super LoRA Loader: lora_bundle is not a list; ignoring")
+            else:
+                try:
+                    lora_configs = json_loads(bundle)
+                except ValueError as e:
+                    print(f"Super LoRA Loader: Failed to parse lora_bundle JSON: {e}")
         else:
             # Fallback: try kwargs (legacy/testing paths like lora_1,...)
             for key, val in kwargs.items():
                 if key.lower().startswith("lora_") and isinstance(val, dict):
                     lora_configs.append(val)
 
-        print(f"Super LoRA Loader: Parsed {len(lora_configs)} lora configs")
-
-        for value in lora_configs:
-            if not isinstance(value, dict):
-                continue
-
-            enabled = bool(value.get('enabled', value.get('on', False)))
-            if not enabled:
-                continue
-
-            lora_name = value.get('lora', 'None')
-            if not lora_name or lora_name == "None":
-                continue
+        logger.debug("Parsed %d lora configs", len(lora_configs))
 
-            strength_model = float(value.get('strength', 1.0))
-            strength_clip = float(value.get('strengthClip', value.get('strengthTwo', strength_model)))
+        for lora_name, value in _active_configs(lora_configs):
+            strength_model = float(_pick_field(value, "strength", 1.0))
+            strength_clip = float(_pick_field(value, "strength_clip", strength_model))
 
             # Respect missing clip
             if current_clip is None:
@@ -122,18 +176,18 @@ class NdSuperLoraLoader:
                 strength_clip = 0
 
             # Apply lora only if any strength is non-zero
-            if (strength_model != 0 or strength_clip != 0) and current_model is not None and LoraLoader is not None:
+            if (strength_model != 0 or strength_clip != 0) and current_model is not None:
                 try:
                     lora_path = get_lora_by_filename(lora_name)
                     if lora_path:
-                        current_model, current_clip = LoraLoader().load_lora(
+                        current_model, current_clip = lora_loader.load_lora(
                             current_model,
                             current_clip,
                             lora_path,
                             strength_model,
                             strength_clip
                         )
-                        print(f"Super LoRA Loader: Loaded '{lora_name}' {strength_model}/{strength_clip}")
+                        logger.debug("Loaded '%s' %s/%s", lora_name, strength_model, strength_clip)
                     else:
                         print(f"Super LoRA Loader: Could not resolve LoRA file for '{lora_name}'")
                 except Exception as e:
@@ -141,14 +195,13 @@ class NdSuperLoraLoader:
                     # Continue to collect trigger words even if load failed
 
             # Collect trigger words (from enabled lorAs)
-            tw = (value.get('triggerWords') or value.get('triggerWord') or '').strip()
+            tw = _trigger_text(_pick_field(value, "trigger_words", ""))
             if tw:
-                trigger_words.append(tw)
-                print(f"Super LoRA Loader: + trigger '{tw}'")
+                trigger_words.setdefault(tw, None)
+                logger.debug("+ trigger '%s'", tw)
 
-        combined_trigger_words = ", ".join(trigger_words) if trigger_words else ""
-        print(f"Returning trigger words: '{combined_trigger_words}'")
-        print("---------------------------------")
+        combined_trigger_words = ", ".join(trigger_words)
+        logger.debug("Returning trigger words: '%s'", combined_trigger_words)
 
         return (current_model, current_clip, combined_trigger_words)
 
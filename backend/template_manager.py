@@ -2,9 +2,10 @@
 Template management system for ND Super Nodes
 """
 
-import json
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+from .json_utils import loads as json_loads, write_json
 
 try:
     import folder_paths
@@ -23,6 +24,11 @@ class TemplateManager:
     def __init__(self):
         self.templates_dir = self._get_templates_directory()
         self._ensure_templates_dir()
+        # Display name -> template file path, so lookups by name don't open every file
+        self._name_index: Dict[str, str] = {}
+        # File path -> (mtime_ns, size, raw bytes, parsed data); files are only
+        # re-read when their stat changes
+        self._file_cache: Dict[str, Tuple[int, int, bytes, Dict[str, Any]]] = {}
     
     def _get_templates_directory(self) -> str:
         """Get the templates directory path."""
@@ -69,9 +75,11 @@ class TemplateManager:
                 "created_at": self._get_timestamp()
             }
             
-            # Save to file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(template_data, f, indent=2, ensure_ascii=False)
+            # Save to file (kept indented so templates stay hand-editable);
+            # replaced atomically so a crash can't leave a truncated template
+            write_json(filepath, template_data, indent=True, durable=True)
+            self._file_cache.pop(filepath, None)
+            self._name_index[name] = filepath
             
             print(f"ND Super Nodes: Template '{name}' saved successfully")
             return True
@@ -90,32 +98,29 @@ class TemplateManager:
         Returns:
             Template data dict, or None if not found
         """
-        try:
-            # Try exact filename first
-            filename = f"{name}.json"
-            filepath = os.path.join(self.templates_dir, filename)
-            
-            if not os.path.exists(filepath):
-                # Try to find by display name
-                for file in os.listdir(self.templates_dir):
-                    if file.endswith('.json'):
-                        try:
-                            test_path = os.path.join(self.templates_dir, file)
-                            with open(test_path, 'r', encoding='utf-8') as f:
-                                data = json.load(f)
-                                if data.get('name') == name:
-                                    filepath = test_path
-                                    break
-                        except:
-                            continue
-                else:
-                    return None
+        raw = self.load_template_raw(name)
+        if raw is None:
+            return None
+        # Parsed fresh so callers can't mutate the cached copy
+        return json_loads(raw)
+    
+    def load_template_raw(self, name: str) -> Optional[bytes]:
+        """
+        Load a template as the JSON bytes stored on disk (served as-is by the web API).
+        
+        Args:
+            name: Template name
             
-            # Load template
-            with open(filepath, 'r', encoding='utf-8') as f:
-                template_data = json.load(f)
+        Returns:
+            Template file contents, or None if not found
+        """
+        try:
+            filepath = self._find_template_path(name)
+            if not filepath:
+                return None
             
-            return template_data
+            raw, _ = self._read_template_file(filepath)
+            return raw
             
         except Exception as e:
             print(f"ND Super Nodes: Error loading template '{name}': {e}")
@@ -134,13 +139,21 @@ class TemplateManager:
             if not os.path.exists(self.templates_dir):
                 return templates
             
-            for filename in os.listdir(self.templates_dir):
-                if filename.endswith('.json'):
+            seen = set()
+            index: Dict[str, str] = {}
+            with os.scandir(self.templates_dir) as entries:
+                for entry in entries:
+                    filename = entry.name
+                    if not filename.endswith('.json'):
+                        continue
                     try:
-                        filepath = os.path.join(self.templates_dir, filename)
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
+                        filepath = entry.path
+                        seen.add(filepath)
+                        _, data = self._read_template_file(filepath, entry.stat())
                         
+                        if data.get('name'):
+                            # First file wins for duplicate names, as in _rebuild_name_index
+                            index.setdefault(data['name'], filepath)
                         templates.append({
                             "name": data.get('name', filename[:-5]),  # Remove .json
                             "filename": filename,
@@ -149,6 +162,11 @@ class TemplateManager:
                     except Exception as e:
                         print(f"ND Super Nodes: Error reading template '{filename}': {e}")
                         continue
+            
+            self._name_index = index
+            # Forget files that were removed outside the manager
+            for stale in self._file_cache.keys() - seen:
+                del self._file_cache[stale]
         
         except Exception as e:
             print(f"ND Super Nodes: Error listing templates: {e}")
@@ -166,31 +184,13 @@ class TemplateManager:
             True if deleted successfully, False otherwise
         """
         try:
-            template_data = self.load_template(name)
-            if not template_data:
+            filepath = self._find_template_path(name)
+            if not filepath:
                 return False
             
-            # Find the actual file
-            filename = f"{name}.json"
-            filepath = os.path.join(self.templates_dir, filename)
-            
-            if not os.path.exists(filepath):
-                # Search for file by display name
-                for file in os.listdir(self.templates_dir):
-                    if file.endswith('.json'):
-                        try:
-                            test_path = os.path.join(self.templates_dir, file)
-                            with open(test_path, 'r', encoding='utf-8') as f:
-                                data = json.load(f)
-                                if data.get('name') == name:
-                                    filepath = test_path
-                                    break
-                        except:
-                            continue
-                else:
-                    return False
-            
             os.remove(filepath)
+            self._file_cache.pop(filepath, None)
+            self._name_index.pop(name, None)
             print(f"ND Super Nodes: Template '{name}' deleted successfully")
             return True
             
@@ -198,16 +198,73 @@ class TemplateManager:
             print(f"ND Super Nodes: Error deleting template '{name}': {e}")
             return False
     
+    def _find_template_path(self, name: str) -> Optional[str]:
+        """
+        Resolve a template name to its file path.
+        
+        Tries the exact filename, then the name index, and only rescans the
+        templates directory when the index has no valid entry for the name.
+        An indexed file only counts while it still holds that template name,
+        since a later save under another name can reuse the same file.
+        """
+        filepath = os.path.join(self.templates_dir, f"{name}.json")
+        if os.path.exists(filepath):
+            return filepath
+        
+        indexed = self._name_index.get(name)
+        if indexed:
+            try:
+                _, data = self._read_template_file(indexed)
+                if data.get('name') == name:
+                    return indexed
+            except Exception:
+                pass
+        
+        self._rebuild_name_index()
+        return self._name_index.get(name)
+    
+    def _rebuild_name_index(self):
+        """Re-read the display name of every template file."""
+        index: Dict[str, str] = {}
+        for file in os.listdir(self.templates_dir):
+            if file.endswith('.json'):
+                try:
+                    test_path = os.path.join(self.templates_dir, file)
+                    _, data = self._read_template_file(test_path)
+                    if data.get('name'):
+                        index.setdefault(data['name'], test_path)
+                except Exception:
+                    continue
+        self._name_index = index
+    
+    def _read_template_file(self, filepath: str, stat: Optional[os.stat_result] = None) -> Tuple[bytes, Dict[str, Any]]:
+        """Return (raw bytes, parsed data) for a template file, re-reading it only when it changed."""
+        if stat is None:
+            stat = os.stat(filepath)
+        cached = self._file_cache.get(filepath)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2], cached[3]
+        
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        data = json_loads(raw)
+        self._file_cache[filepath] = (stat.st_mtime_ns, stat.st_size, raw, data)
+        return raw, data
+    
     def _get_timestamp(self) -> str:
         """Get current timestamp as ISO string."""
         from datetime import datetime
         return datetime.now().isoformat()
 
 
-# Global template manager instance
-_template_manager = TemplateManager()
+# Global template manager instance, created on first use so importing this
+# module doesn't touch the filesystem
+_template_manager: Optional[TemplateManager] = None
 
 
 def get_template_manager() -> TemplateManager:
     """Get the global template manager instance."""
+    global _template_manager
+    if _template_manager is None:
+        _template_manager = TemplateManager()
     return _template_manager
@@ -10,7 +10,7 @@ import time
 import urllib.error
 import urllib.request
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 try:
     import aiohttp
@@ -22,6 +22,8 @@ try:
 except Exception:  # pragma: no cover - folder_paths unavailable outside ComfyUI
     folder_paths = None  # type: ignore
 
+from .json_utils import dumps as json_dumps, loads as json_loads, write_json
+
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 VERSION_FILE = os.path.join(ROOT_DIR, "version.json")
 CACHE_FILENAME = "nd_super_nodes_update_cache.json"
@@ -32,6 +34,8 @@ USER_AGENT = "ND-Super-Nodes-Updater"
 _cache_data: Optional[Dict[str, Any]] = None
 _cache_lock = asyncio.Lock()
 _cache_timestamp: float = 0.0
+# (status dict, its JSON bytes, checkedAt as epoch seconds) for the last status served
+_cache_body: Optional[Tuple[Dict[str, Any], bytes, float]] = None
 
 
 def _now() -> datetime:
@@ -56,16 +60,16 @@ def _cache_path() -> str:
 
 def _read_json(path: str) -> Optional[Dict[str, Any]]:
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return json_loads(f.read())
     except Exception:
         return None
 
 
 def _write_json(path: str, payload: Dict[str, Any]) -> None:
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2, ensure_ascii=False)
+        # Machine-read cache: compact output, atomic replace without fsync
+        write_json(path, payload)
     except Exception as exc:
         print(f"ND Super Nodes: Failed to write cache '{path}': {exc}")
 
@@ -214,12 +218,34 @@ async def get_update_status(force: bool = False) -> Dict[str, Any]:
         return status
 
 
+def _checked_at_epoch(status: Dict[str, Any]) -> float:
+    try:
+        return datetime.fromisoformat(status.get("checkedAt")).timestamp()
+    except Exception:
+        return _cache_timestamp or time.time()
+
+
+async def get_update_status_body(force: bool = False) -> Tuple[float, bytes]:
+    """
+    Return (last_modified_epoch, JSON bytes) for the current update status.
+
+    The bytes are serialized once per status, so repeated polls of an
+    unchanged status skip encoding entirely.
+    """
+    global _cache_body
+    status = await get_update_status(force=force)
+    if _cache_body is None or _cache_body[0] is not status:
+        _cache_body = (status, json_dumps(status), _checked_at_epoch(status))
+    return _cache_body[2], _cache_body[1]
+
+
 async def clear_update_cache() -> None:
     """Remove cached update data (useful for tests/debug)."""
-    global _cache_data, _cache_timestamp
+    global _cache_data, _cache_timestamp, _cache_body
     async with _cache_lock:
         _cache_data = None
         _cache_timestamp = 0.0
+        _cache_body = None
         cache_file = _cache_path()
         try:
             if os.path.exists(cache_file):
@@ -2,26 +2,380 @@
 Web API endpoints for ND Super Nodes
 """
 
-import json
+import asyncio
+import functools
+import gzip
+import hashlib
+import itertools
 from aiohttp import web
 import os
+import sys
+import time
+from collections import OrderedDict
 try:
     import folder_paths
 except Exception:
     folder_paths = None
-from .lora_utils import get_available_loras, extract_trigger_words
+try:
+    import zstandard  # type: ignore
+except ImportError:  # optional; gzip is always available
+    zstandard = None
+from .io_utils import run_blocking as _run_blocking
+from .json_utils import dumps as json_dumps, loads as json_loads
+from .lora_utils import get_available_loras, extract_trigger_words, extract_trigger_words_many, invalidate_dir_cache
 from .template_manager import get_template_manager
 from .civitai_service import get_civitai_service
-from .version_utils import get_update_status
+from .version_utils import get_update_status_body
+
+# Directories never descended into, matching folder_paths' own recursive search
+_EXCLUDED_DIR_NAMES = frozenset({".git"})
+
+# Directory path -> (mtime_ns, extensions of the files directly in it, subdirectories),
+# recorded while scanning. Lets a filtered scan skip subtrees that hold no
+# matching files without listing them again.
+_DIR_EXT_CACHE = {}
+
+# Serialized listing responses: cache key -> (expires_at, root mtimes, listing),
+# where a listing is (body bytes, digest, {encoding: compressed body}) and the
+# compressed copies are filled in on first use.
+# Root mtimes catch files added/removed at the top level right away; deeper
+# changes show up once the short TTL runs out. Keys include the client's
+# extensions filter, so the cache is a small LRU rather than unbounded.
+_LIST_CACHE = OrderedDict()
+_LIST_CACHE_TTL = 5.0
+_LIST_CACHE_SIZE = 32
+
+
+# Template files are read/written one at a time so that concurrent saves of
+# the same template never race on its temp file
+_TEMPLATE_IO_LOCK = asyncio.Lock()
+
+
+async def _template_io(func, *args):
+    async with _TEMPLATE_IO_LOCK:
+        return await _run_blocking(func, *args)
+
+
+def _root_mtimes(dirs):
+    mtimes = []
+    for d in dirs:
+        try:
+            mtimes.append(os.stat(d).st_mtime_ns)
+        except OSError:
+            mtimes.append(None)
+    return tuple(mtimes)
+
+
+def _wants_refresh(request):
+    return request.rel_url.query.get("refresh", "").lower() in {"1", "true", "yes"}
+
+
+def _resolve_folder(folder_name):
+    """Map a folder name to (dirs, lowercase extensions), read fresh from folder_paths."""
+    # Map legacy names and resolve directories
+    mapped = folder_paths.map_legacy(folder_name)
+    dirs, supported = folder_paths.folder_names_and_paths.get(mapped, ([], set()))
+    if not dirs:
+        # try direct
+        dirs, supported = folder_paths.folder_names_and_paths.get(folder_name, ([], set()))
+    return tuple(dirs), frozenset(e.lower() for e in supported)
+
+
+def _cached_listing(request, key, dirs):
+    """Return the cached listing for key if still fresh, else None. ?refresh=1 skips the cache."""
+    if _wants_refresh(request):
+        return None
+    cached = _LIST_CACHE.get(key)
+    if cached is None:
+        return None
+    expires_at, mtimes, listing = cached
+    if time.monotonic() >= expires_at or mtimes != _root_mtimes(dirs):
+        _LIST_CACHE.pop(key, None)
+        return None
+    _LIST_CACHE.move_to_end(key)
+    return listing
+
+
+def _listing(body):
+    """Wrap response bytes as (body, digest, compressed copies) for _etag_response."""
+    return body, hashlib.blake2b(body, digest_size=8).hexdigest(), {}
+
+
+def _store_listing(key, dirs, payload):
+    listing = _listing(json_dumps(payload))
+    now = time.monotonic()
+    for stale in [k for k, (expires_at, _, _) in _LIST_CACHE.items() if expires_at <= now]:
+        del _LIST_CACHE[stale]
+    _LIST_CACHE[key] = (now + _LIST_CACHE_TTL, _root_mtimes(dirs), listing)
+    _LIST_CACHE.move_to_end(key)
+    while len(_LIST_CACHE) > _LIST_CACHE_SIZE:
+        _LIST_CACHE.popitem(last=False)
+    return listing
+
+
+def _json_body_response(body, status=200):
+    return web.Response(body=body, status=status, content_type="application/json", charset="utf-8")
+
+
+# Listing bodies at least this large are sent compressed when the client accepts it
+_COMPRESS_MIN_BYTES = 4096
+
+
+class _PrecompressedResponse(web.Response):
+    """Response whose body is already encoded; ignores compression requested by other middleware."""
+
+    def enable_compression(self, *args, **kwargs):
+        pass
+
+
+def _accepted_encodings(request):
+    accepted = set()
+    for token in request.headers.get("Accept-Encoding", "").lower().split(","):
+        coding, _, params = token.partition(";")
+        if params.replace(" ", "") in {"q=0", "q=0.0", "q=0.00", "q=0.000"}:
+            continue
+        accepted.add(coding.strip())
+    return accepted
+
+
+def _pick_encoding(request, body):
+    if len(body) < _COMPRESS_MIN_BYTES:
+        return None
+    accepted = _accepted_encodings(request)
+    if zstandard is not None and "zstd" in accepted:
+        return "zstd"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def _compress(body, encoding):
+    """Blocking: compressed copy of a listing body; run via _run_blocking."""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+
+def _etag_matches(request, etag):
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag or candidate == "*":
+            return True
+    return False
+
+
+async def _etag_response(request, listing):
+    """Serve a _listing with an ETag (compressed when worthwhile); 304 when the client has it."""
+    body, digest, compressed = listing
+    encoding = _pick_encoding(request, body)
+    # Each encoding is a distinct representation, so it gets its own tag
+    etag = f'"{digest}-{encoding}"' if encoding else f'"{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if _etag_matches(request, etag):
+        return web.Response(status=304, headers=headers)
+    if encoding is None:
+        resp = _json_body_response(body)
+    else:
+        # Cached listings keep their compressed copies, so repeat hits skip this
+        encoded = compressed.get(encoding)
+        if encoded is None:
+            encoded = compressed[encoding] = await _run_blocking(_compress, body, encoding)
+        resp = _PrecompressedResponse(body=encoded, content_type="application/json", charset="utf-8")
+        headers["Content-Encoding"] = encoding
+    resp.headers.update(headers)
+    return resp
+
+
+async def _read_json(request):
+    """Parse the request body with json_utils (orjson when available) instead of request.json()."""
+    return json_loads(await request.read())
+
+
+def _json_response(obj, status=200):
+    """web.json_response replacement that serializes through json_utils (orjson when available)."""
+    return _json_body_response(json_dumps(obj), status=status)
 
 
 async def get_loras(request):
     """Get list of available LoRA files"""
     try:
-        loras = get_available_loras()
-        return web.json_response({"loras": loras})
+        if folder_paths is None:
+            return _json_response({"loras": await _run_blocking(get_available_loras)})
+        if _wants_refresh(request):
+            invalidate_dir_cache()  # pick up LoRA paths added since startup
+        dirs = tuple(folder_paths.get_folder_paths("loras") or [])
+        key = ("loras", dirs)
+        listing = _cached_listing(request, key, dirs)
+        if listing is None:
+            # Walks (cold) or stats (warm) every LoRA folder, so not on the loop
+            listing = _store_listing(key, dirs, {"loras": await _run_blocking(get_available_loras)})
+        return await _etag_response(request, listing)
+    except Exception as e:
+        return _json_response({"error": str(e)}, status=500)
+
+
+def _forget_dir(path):
+    """Drop the _DIR_EXT_CACHE entries for path and every subdirectory recorded under it."""
+    stack = [path]
+    while stack:
+        cached = _DIR_EXT_CACHE.pop(stack.pop(), None)
+        if cached is not None:
+            stack.extend(cached[2])
+
+
+def _subtree_may_match(path, supported):
+    """
+    Return False only when the cache proves no file under path has a supported extension.
+
+    A directory's mtime changes only when its direct entries do, so every
+    directory in the subtree is checked (one stat each, no listing).
+    """
+    stack = [path]
+    while stack:
+        current = stack.pop()
+        cached = _DIR_EXT_CACHE.get(current)
+        if cached is None:
+            return True
+        try:
+            if os.stat(current).st_mtime_ns != cached[0]:
+                return True
+        except OSError:
+            _forget_dir(current)  # deleted (or unreadable) since it was scanned
+            return True
+        if not supported.isdisjoint(cached[1]):
+            return True
+        stack.extend(cached[2])
+    return False
+
+
+def _iter_dir_files(d, supported):
+    """Yield a file record for every matching file under d (recursive)."""
+    # Resolve the filter once instead of re-checking it (and building {""}) per file
+    allow_any = not supported or supported == {""}
+    supported = frozenset(supported or ())
+    scandir = os.scandir
+    intern = sys.intern
+    # Every entry path starts with the root plus a separator, so the relative
+    # path is a slice; no relpath normalization (and getcwd) per file
+    prefix_len = len(os.path.join(d, ""))
+    windows = os.sep == "\\"
+    # Recurse into subfolders with an explicit stack; DirEntry carries the
+    # file type from the directory listing, so only the final stat is a syscall
+    stack = [d]
+    push = stack.append
+    while stack:
+        dirpath = stack.pop()
+        try:
+            dir_mtime = os.stat(dirpath).st_mtime_ns
+            entries = scandir(dirpath)
+        except OSError:
+            _forget_dir(dirpath)
+            continue  # unreadable directory: skip it, keep walking the rest
+        exts_here = set()
+        subdirs = []
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _EXCLUDED_DIR_NAMES:
+                        subdirs.append(entry.path)
+                    continue
+                if not entry.is_file():
+                    continue
+                name = entry.name
+                stem, dot, suffix = name.rpartition(".")
+                ext = ("." + suffix).lower() if dot and stem.lstrip(".") else ""
+                exts_here.add(ext)
+                if not allow_any and ext not in supported:
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue  # vanished or unreadable entry: skip just this file
+                # A listing repeats a handful of extensions thousands of times;
+                # share one string object per extension across the records
+                ext = intern(ext)
+                rel = entry.path[prefix_len:]
+                if windows:
+                    rel = rel.replace("\\", "/")
+                yield {
+                    "name": name,
+                    "path": rel,
+                    "extension": ext,
+                    "size": st.st_size,
+                    "modified": st.st_mtime
+                }
+        previous = _DIR_EXT_CACHE.get(dirpath)
+        if previous is not None:
+            for gone in set(previous[2]).difference(subdirs):
+                _forget_dir(gone)
+        _DIR_EXT_CACHE[dirpath] = (dir_mtime, frozenset(exts_here), tuple(subdirs))
+        for subdir in subdirs:
+            if allow_any or _subtree_may_match(subdir, supported):
+                push(subdir)
+
+
+def _scan_dir(d, supported):
+    """Blocking scan of one root directory; run off the event loop via _run_blocking."""
+    return list(_iter_dir_files(d, supported))
+
+
+# Records pulled from the scan per worker hop when streaming a listing
+_STREAM_BATCH = 256
+
+
+def _next_batch(files):
+    """Blocking: pull up to _STREAM_BATCH records from a _iter_dir_files generator."""
+    return list(itertools.islice(files, _STREAM_BATCH))
+
+
+async def _stream_files(request, dirs, supported):
+    """Write the get_files payload incrementally, a batch of records at a time."""
+    resp = web.StreamResponse(headers={"Content-Type": "application/json"})
+    await resp.prepare(request)
+    # Headers are already sent from here on, so failures can't become a 500
+    # response; the connection is dropped instead, leaving the JSON truncated
+    try:
+        await _write_file_stream(resp, dirs, supported)
+        await resp.write_eof()
+    except ConnectionResetError:
+        pass  # client went away
     except Exception as e:
-        return web.json_response({"error": str(e)}, status=500)
+        print(f"ND Super Nodes: Error streaming file list: {e}")
+        resp.force_close()
+        if request.transport is not None:
+            request.transport.close()
+    return resp
+
+
+async def _write_file_stream(resp, dirs, supported):
+    await resp.write(b'{"files":[')
+    total = 0
+    for d in dirs:
+        files = _iter_dir_files(d, supported)
+        # The walk advances in the worker pool one batch at a time; the next
+        # batch is scanned while the current one is written to the client
+        pending = _run_blocking(_next_batch, files)
+        try:
+            while True:
+                batch = await pending
+                if not batch:
+                    break
+                pending = _run_blocking(_next_batch, files)
+                chunk = b",".join(json_dumps(record) for record in batch)
+                await resp.write((b"," if total else b"") + chunk)
+                total += len(batch)
+        finally:
+            # A client that went away leaves a batch in flight; let it finish
+            # before closing the generator it is iterating
+            if not pending.done():
+                await asyncio.wait([pending])
+            files.close()
+    await resp.write(b'],"total":' + str(total).encode("ascii") + b"}")
 
 
 async def get_files(request):
@@ -32,51 +386,38 @@ async def get_files(request):
         extensions = [e.strip().lower() for e in ext_param.split(",") if e.strip()]
 
         if not folder_name:
-            return web.json_response({"error": "folder_name is required", "files": []}, status=400)
+            return _json_response({"error": "folder_name is required", "files": []}, status=400)
 
         if folder_paths is None:
-            return web.json_response({"error": "folder_paths unavailable", "files": []}, status=500)
+            return _json_response({"error": "folder_paths unavailable", "files": []}, status=500)
 
-        # Map legacy names and resolve directories
-        mapped = folder_paths.map_legacy(folder_name)
-        dirs, supported = folder_paths.folder_names_and_paths.get(mapped, ([], set()))
-        if not dirs:
-            # try direct
-            dirs, supported = folder_paths.folder_names_and_paths.get(folder_name, ([], set()))
+        dirs, supported = _resolve_folder(folder_name)
 
         # Filter extensions
         if extensions:
-            supported = set([e.lower() for e in extensions])
+            supported = frozenset(extensions)
 
-        out_files = []
-        for d in dirs:
-            if not os.path.isdir(d):
-                continue
-            try:
-                # Recurse into subfolders
-                for root, _, files in os.walk(d):
-                    for name in files:
-                        fp = os.path.join(root, name)
-                        if not os.path.isfile(fp):
-                            continue
-                        _, ext = os.path.splitext(name)
-                        if supported and ext.lower() not in supported and supported != {""}:
-                            continue
-                        st = os.stat(fp)
-                        out_files.append({
-                            "name": name,
-                            "path": os.path.relpath(fp, d).replace("\\", "/"),
-                            "extension": ext.lower(),
-                            "size": st.st_size,
-                            "modified": st.st_mtime
-                        })
-            except Exception:
-                continue
+        dirs = [d for d in dirs if os.path.isdir(d)]
+
+        # ?sorted=0 streams entries as they are found instead of buffering and sorting
+        if request.rel_url.query.get("sorted", "1").lower() in {"0", "false", "no"}:
+            return await _stream_files(request, dirs, supported)
+
+        key = ("files", tuple(dirs), supported)
+        listing = _cached_listing(request, key, dirs)
+        if listing is not None:
+            return await _etag_response(request, listing)
+
+        # Scan every root in a worker thread: keeps the event loop free and lets
+        # roots on different disks/mounts be walked in parallel
+        results = await asyncio.gather(*[_run_blocking(_scan_dir, d, supported) for d in dirs])
+        out_files = [record for files in results for record in files]
 
         out_files.sort(key=lambda x: x["name"].lower())
-        return web.json_response({"files": out_files, "total": len(out_files)})
+        listing = _store_listing(key, dirs, {"files": out_files, "total": len(out_files)})
+        return await _etag_response(request, listing)
     except Exception as e:
-        return web.json_response({"error": str(e), "files": []}, status=500)
+        return _json_response({"error": str(e), "files": []}, status=500)
 
 
 async def get_templates(request):
@@ -87,33 +428,33 @@ async def get_templates(request):
         # Support GET /super_lora/templates?name=Foo for compatibility
         name = request.rel_url.query.get("name")
         if name:
-            template = template_manager.load_template(name)
+            template = await _template_io(template_manager.load_template_raw, name)
             if template:
-                return web.json_response(template)
-            return web.json_response({"error": "Template not found"}, status=404)
+                return _json_body_response(template)
+            return _json_response({"error": "Template not found"}, status=404)
 
-        templates = template_manager.list_templates()
-        return web.json_response({"templates": templates})
+        templates = await _template_io(template_manager.list_templates)
+        return await _etag_response(request, _listing(json_dumps({"templates": templates})))
     except Exception as e:
-        return web.json_response({"error": str(e)}, status=500)
+        return _json_response({"error": str(e)}, status=500)
 
 
 async def save_template(request):
     """Save a LoRA template or handle action-based operations (e.g., delete)"""
     try:
-        data = await request.json()
+        data = await _read_json(request)
         action = data.get("action")
 
         # Backward-compatible action handler: POST with { action: 'delete', name }
         if action == "delete":
             name = data.get("name")
             if not name:
-                return web.json_response({"error": "Template name is required"}, status=400)
+                return _json_response({"error": "Template name is required"}, status=400)
             template_manager = get_template_manager()
-            deleted = template_manager.delete_template(name)
+            deleted = await _template_io(template_manager.delete_template, name)
             if deleted:
-                return web.json_response({"success": True, "message": f"Template '{name}' deleted"})
-            return web.json_response({"error": "Template not found or could not be deleted"}, status=404)
+                return _json_response({"success": True, "message": f"Template '{name}' deleted"})
+            return _json_response({"error": "Template not found or could not be deleted"}, status=404)
 
         name = data.get("name")
         # Accept both 'lora_configs' (preferred) and 'loras' (compat)
@@ -122,18 +463,18 @@ async def save_template(request):
             lora_configs = data.get("loras", [])
 
         if not name:
-            return web.json_response({"error": "Template name is required"}, status=400)
+            return _json_response({"error": "Template name is required"}, status=400)
 
         template_manager = get_template_manager()
-        success = template_manager.save_template(name, lora_configs)
+        success = await _template_io(template_manager.save_template, name, lora_configs)
 
         if success:
-            return web.json_response({"success": True, "message": f"Template '{name}' saved"})
+            return _json_response({"success": True, "message": f"Template '{name}' saved"})
         else:
-            return web.json_response({"error": "Failed to save template"}, status=500)
+            return _json_response({"error": "Failed to save template"}, status=500)
 
     except Exception as e:
-        return web.json_response({"error": str(e)}, status=500)
+        return _json_response({"error": str(e)}, status=500)
 
 
 async def load_template(request):
@@ -142,28 +483,28 @@ async def load_template(request):
         template_name = request.match_info.get("name")
         
         if not template_name:
-            return web.json_response({"error": "Template name is required"}, status=400)
+            return _json_response({"error": "Template name is required"}, status=400)
         
         template_manager = get_template_manager()
-        template_data = template_manager.load_template(template_name)
+        template_data = await _template_io(template_manager.load_template_raw, template_name)
         
         if template_data:
-            return web.json_response(template_data)
+            return _json_body_response(template_data)
         else:
-            return web.json_response({"error": "Template not found"}, status=404)
+            return _json_response({"error": "Template not found"}, status=404)
             
     except Exception as e:
-        return web.json_response({"error": str(e)}, status=500)
+        return _json_response({"error": str(e)}, status=500)
 
 
 async def get_civitai_info(request):
     """Get CivitAI info for a LoRA"""
     try:
-        data = await request.json()
+        data = await _read_json(request)
         lora_filename = data.get("lora_filename")
         
         if not lora_filename:
-            return web.json_response({"error": "LoRA filename is required"}, status=400)
+            return _json_response({"error": "LoRA filename is required"}, status=400)
         
         civitai_service = get_civitai_service()
         trigger_words = await civitai_service.get_trigger_words(lora_filename)
@@ -171,7 +512,7 @@ async def get_civitai_info(request):
         # Fallback: try extracting from LoRA metadata if CivitAI returns nothing
         if not trigger_words:
             try:
-                meta_words = extract_trigger_words(lora_filename)
+                meta_words = await _run_blocking(extract_trigger_words, lora_filename)
                 if meta_words:
                     trigger_words = meta_words
             except Exception:
@@ -185,26 +526,71 @@ async def get_civitai_info(request):
             "success": True
         }
 
-        return web.json_response(payload)
+        return _json_response(payload)
         
     except Exception as e:
-        return web.json_response({"error": str(e)}, status=500)
+        return _json_response({"error": str(e)}, status=500)
+
+
+# LoRAs looked up at once by the batch endpoint
+_CIVITAI_BATCH_CONCURRENCY = 4
+
+
+async def get_civitai_info_batch(request):
+    """Get CivitAI info for several LoRAs in one request: { lora_filenames: [...] }"""
+    try:
+        data = await _read_json(request)
+        lora_filenames = data.get("lora_filenames")
+
+        if not isinstance(lora_filenames, list) or not lora_filenames:
+            return _json_response({"error": "lora_filenames must be a non-empty list"}, status=400)
+
+        names = list(dict.fromkeys(name for name in lora_filenames if isinstance(name, str) and name))
+        civitai_service = get_civitai_service()
+        # Each lookup hashes a whole LoRA file and calls CivitAI; only a few run at once
+        limit = asyncio.Semaphore(_CIVITAI_BATCH_CONCURRENCY)
+
+        async def lookup(name):
+            async with limit:
+                return await civitai_service.get_trigger_words(name)
+
+        found = await asyncio.gather(*[lookup(name) for name in names], return_exceptions=True)
+        results = {
+            name: (words if isinstance(words, list) else [])
+            for name, words in zip(names, found)
+        }
+
+        # Fallback: read LoRA metadata for everything CivitAI had nothing for
+        missing = [name for name, words in results.items() if not words]
+        if missing:
+            try:
+                meta = await _run_blocking(extract_trigger_words_many, missing)
+                for name, words in meta.items():
+                    if words:
+                        results[name] = words
+            except Exception:
+                pass
+
+        return _json_response({"results": results, "success": True})
+
+    except Exception as e:
+        return _json_response({"error": str(e)}, status=500)
 
 
 async def delete_template(request):
     """Delete a template via JSON body: { name }"""
     try:
-        data = await request.json()
+        data = await _read_json(request)
         name = data.get("name")
         if not name:
-            return web.json_response({"error": "Template name is required"}, status=400)
+            return _json_response({"error": "Template name is required"}, status=400)
         template_manager = get_template_manager()
-        deleted = template_manager.delete_template(name)
+        deleted = await _template_io(template_manager.delete_template, name)
         if deleted:
-            return web.json_response({"success": True, "message": f"Template '{name}' deleted"})
-        return web.json_response({"error": "Template not found"}, status=404)
+            return _json_response({"success": True, "message": f"Template '{name}' deleted"})
+        return _json_response({"error": "Template not found"}, status=404)
     except Exception as e:
-        return web.json_response({"error": str(e)}, status=500)
+        return _json_response({"error": str(e)}, status=500)
 
 
 async def delete_template_by_name(request):
@@ -212,49 +598,62 @@ async def delete_template_by_name(request):
     try:
         name = request.match_info.get("name")
         if not name:
-            return web.json_response({"error": "Template name is required"}, status=400)
+            return _json_response({"error": "Template name is required"}, status=400)
         template_manager = get_template_manager()
-        deleted = template_manager.delete_template(name)
+        deleted = await _template_io(template_manager.delete_template, name)
         if deleted:
-            return web.json_response({"success": True, "message": f"Template '{name}' deleted"})
-        return web.json_response({"error": "Template not found"}, status=404)
+            return _json_response({"success": True, "message": f"Template '{name}' deleted"})
+        return _json_response({"error": "Template not found"}, status=404)
     except Exception as e:
-        return web.json_response({"error": str(e)}, status=500)
+        return _json_response({"error": str(e)}, status=500)
 
 
 async def get_version_info(request):
     """Return local version info plus cached update availability."""
     try:
         force = request.rel_url.query.get("force") in {"1", "true", "yes"}
-        status = await get_update_status(force=force)
-        return web.json_response(status)
+        last_modified, body = await get_update_status_body(force=force)
+        since = request.if_modified_since
+        if not force and since is not None and int(last_modified) <= int(since.timestamp()):
+            resp = web.Response(status=304)
+        else:
+            resp = _json_body_response(body)
+        resp.last_modified = int(last_modified)
+        resp.headers["Cache-Control"] = "no-cache"
+        return resp
     except Exception as e:
-        return web.json_response({"error": str(e)}, status=500)
+        return _json_response({"error": str(e)}, status=500)
+
+
+# (method, path, handler) for every endpoint, under both the /super_lora prefix
+# and the legacy /superlora alias used by older frontends / workflows
+_ROUTE_TABLE = (
+    ("GET", "/loras", get_loras),
+    ("GET", "/files", get_files),
+    ("GET", "/templates", get_templates),
+    ("POST", "/templates", save_template),
+    ("GET", "/templates/{name}", load_template),
+    # Deletion endpoints (compatibility and RESTful)
+    ("DELETE", "/templates", delete_template),  # expects JSON body { name }
+    ("POST", "/templates/delete", delete_template),  # expects JSON body { name }
+    ("DELETE", "/templates/{name}", delete_template_by_name),
+    ("POST", "/civitai_info", get_civitai_info),
+    ("POST", "/civitai_info/batch", get_civitai_info_batch),
+    ("GET", "/version", get_version_info),
+)
+ROUTES = tuple(
+    (method, prefix + path, handler)
+    for prefix in ("/super_lora", "/superlora")
+    for method, path, handler in _ROUTE_TABLE
+)
 
 
 # Route registration function
 def register_routes(app):
     """Register all Super LoRA Loader routes"""
-    app.router.add_get("/super_lora/loras", get_loras)
-    app.router.add_get("/super_lora/files", get_files)
-    app.router.add_get("/super_lora/templates", get_templates)
-    app.router.add_post("/super_lora/templates", save_template)
-    app.router.add_get("/super_lora/templates/{name}", load_template)
-    # Deletion endpoints (compatibility and RESTful)
-    app.router.add_delete("/super_lora/templates", delete_template)  # expects JSON body { name }
-    app.router.add_post("/super_lora/templates/delete", delete_template)  # expects JSON body { name }
-    app.router.add_delete("/super_lora/templates/{name}", delete_template_by_name)
-    app.router.add_post("/super_lora/civitai_info", get_civitai_info)
-    app.router.add_get("/super_lora/version", get_version_info)
-
-    # Legacy aliases without underscore for older frontends / workflows
-    app.router.add_get("/superlora/loras", get_loras)
-    app.router.add_get("/superlora/files", get_files)
-    app.router.add_get("/superlora/templates", get_templates)
-    app.router.add_post("/superlora/templates", save_template)
-    app.router.add_get("/superlora/templates/{name}", load_template)
-    app.router.add_delete("/superlora/templates", delete_template)
-    app.router.add_post("/superlora/templates/delete", delete_template)
-    app.router.add_delete("/superlora/templates/{name}", delete_template_by_name)
-    app.router.add_post("/superlora/civitai_info", get_civitai_info)
-    app.router.add_get("/superlora/version", get_version_info)
+    router = app.router
+    for method, path, handler in ROUTES:
+        if method == "GET":
+            router.add_get(path, handler)  # also answers HEAD
+        else:
+            router.add_route(method, path, handler)
@@ -1,3 +1,5 @@
+import contextlib
+import json
 import os
 import tempfile
 import unittest
@@ -6,19 +8,42 @@ from types import SimpleNamespace
 from backend import lora_utils
 
 
+@contextlib.contextmanager
+def sandbox_folder_paths(folder_paths):
+    """Install a folder_paths stand-in on lora_utils, restoring the original on exit."""
+    original_folder_paths = lora_utils.folder_paths
+    original_flag = lora_utils.COMFYUI_AVAILABLE
+    lora_utils.folder_paths = folder_paths
+    lora_utils.COMFYUI_AVAILABLE = True
+    lora_utils.invalidate_dir_cache()
+    try:
+        yield folder_paths
+    finally:
+        lora_utils.folder_paths = original_folder_paths
+        lora_utils.COMFYUI_AVAILABLE = original_flag
+        lora_utils.invalidate_dir_cache()
+
+
 class ResolveLoraFullPathTests(unittest.TestCase):
-    def setUp(self) -> None:
-        self.tmp_default = tempfile.TemporaryDirectory()
-        self.tmp_extra = tempfile.TemporaryDirectory()
-        self.addCleanup(self.tmp_default.cleanup)
-        self.addCleanup(self.tmp_extra.cleanup)
-
-        self.relative_path = os.path.join("Qwen", "anime", "MysticAnime.safetensors")
-        self.file_path = os.path.join(self.tmp_extra.name, self.relative_path)
-        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
-        with open(self.file_path, "wb") as handle:
+    @classmethod
+    def setUpClass(cls) -> None:
+        # The LoRA folders are shared by every test; tests that add files
+        # remove them again through _write_lora
+        cls.tmp_default = tempfile.TemporaryDirectory()
+        cls.tmp_extra = tempfile.TemporaryDirectory()
+
+        cls.relative_path = os.path.join("Qwen", "anime", "MysticAnime.safetensors")
+        cls.file_path = os.path.join(cls.tmp_extra.name, cls.relative_path)
+        os.makedirs(os.path.dirname(cls.file_path), exist_ok=True)
+        with open(cls.file_path, "wb") as handle:
             handle.write(b"stub")
 
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.tmp_default.cleanup()
+        cls.tmp_extra.cleanup()
+
+    def setUp(self) -> None:
         def get_folder_paths(category: str):
             self.assertEqual(category, "loras")
             return [self.tmp_default.name, self.tmp_extra.name]
@@ -28,33 +53,172 @@ class ResolveLoraFullPathTests(unittest.TestCase):
             # ComfyUI emits forward slashes regardless of OS for nested entries
             return [self.relative_path.replace(os.sep, "/")]
 
+        self.get_full_path_calls = 0
+
         def get_full_path(category: str, name: str):
             self.assertEqual(category, "loras")
+            self.get_full_path_calls += 1
             normalized = os.path.normpath(name)
             for base_dir in [self.tmp_default.name, self.tmp_extra.name]:
                 candidate = os.path.join(base_dir, normalized)
-                if os.path.exists(candidate):
+                if os.path.isfile(candidate):
                     return candidate
             raise FileNotFoundError(name)
 
-        self._original_folder_paths = lora_utils.folder_paths
-        self._original_flag = lora_utils.COMFYUI_AVAILABLE
-        lora_utils.folder_paths = SimpleNamespace(
+        # Entered by hand (enterContext needs Python 3.11); the exit is registered
+        # right away so nothing later in setUp can leave the stub installed
+        sandbox = sandbox_folder_paths(SimpleNamespace(
             get_folder_paths=get_folder_paths,
             get_filename_list=get_filename_list,
             get_full_path=get_full_path,
-        )
-        lora_utils.COMFYUI_AVAILABLE = True
-        self.addCleanup(self._restore_folder_paths)
+        ))
+        sandbox.__enter__()
+        self.addCleanup(sandbox.__exit__, None, None, None)
+
+    def _write_lora(self, base_dir: str, relative_path: str, data: bytes = b"stub") -> str:
+        path = os.path.join(base_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as handle:
+            handle.write(data)
+        self.addCleanup(os.remove, path)
+        return path
 
-    def _restore_folder_paths(self):
-        lora_utils.folder_paths = self._original_folder_paths
-        lora_utils.COMFYUI_AVAILABLE = self._original_flag
+    def _pretend_watching(self) -> None:
+        """Mark a filesystem observer as running: scans stop being revalidated by mtime."""
+        lora_utils._WATCHER.update({"observer": object(), "dirs": (self.tmp_default.name, self.tmp_extra.name)})
+        self.addCleanup(lora_utils._WATCHER.update, {"observer": None, "dirs": ()})
 
     def test_resolve_uses_extra_directory(self):
         result = lora_utils.resolve_lora_full_path(self.relative_path.replace(os.sep, "/"))
         self.assertIsNotNone(result)
         self.assertEqual(os.path.normpath(result), os.path.normpath(self.file_path))
+        self.assertEqual(self.get_full_path_calls, 0)
+
+    def test_resolve_outside_extension_list_skips_get_full_path(self):
+        odd_file = self._write_lora(self.tmp_extra.name, os.path.join("Qwen", "odd.weights"))
+
+        result = lora_utils.resolve_lora_full_path("Qwen/odd.weights")
+        self.assertEqual(os.path.normpath(result), os.path.normpath(odd_file))
+        self.assertEqual(self.get_full_path_calls, 0)
+
+    def test_resolve_batch(self):
+        default_file = self._write_lora(self.tmp_default.name, "base.safetensors")
+        nested = self.relative_path.replace(os.sep, "/")
+
+        result = lora_utils.resolve_lora_full_paths([nested, "base.safetensors", "missing.safetensors", nested])
+        self.assertEqual(list(result), [nested, "base.safetensors", "missing.safetensors"])
+        self.assertEqual(os.path.normpath(result[nested]), os.path.normpath(self.file_path))
+        self.assertEqual(os.path.normpath(result["base.safetensors"]), os.path.normpath(default_file))
+        self.assertIsNone(result["missing.safetensors"])
+
+    def test_cache_invalidates_on_new_file(self):
+        # Warm the directory scans, then add a file next to the indexed one
+        self.assertIsNotNone(lora_utils.resolve_lora_full_path(self.relative_path.replace(os.sep, "/")))
+        fresh = self._write_lora(self.tmp_extra.name, os.path.join("Qwen", "anime", "Fresh.safetensors"))
+
+        result = lora_utils.resolve_lora_full_path("Qwen/anime/Fresh.safetensors")
+        self.assertIsNotNone(result)
+        self.assertEqual(os.path.normpath(result), os.path.normpath(fresh))
+
+    def test_watcher_event_invalidates_cached_miss(self):
+        self._pretend_watching()
+
+        name = "Qwen/anime/Watched.safetensors"
+        self.assertIsNone(lora_utils.resolve_lora_full_path(name))
+        watched = self._write_lora(self.tmp_extra.name, os.path.join("Qwen", "anime", "Watched.safetensors"))
+        self.assertIsNone(lora_utils.resolve_lora_full_path(name))
+
+        event = SimpleNamespace(event_type="created", is_directory=False, src_path=watched)
+        lora_utils._LoraDirEventHandler().on_any_event(event)
+        result = lora_utils.resolve_lora_full_path(name)
+        self.assertIsNotNone(result)
+        self.assertEqual(os.path.normpath(result), os.path.normpath(watched))
+
+    def test_missed_watcher_event_recovers(self):
+        self._pretend_watching()
+        self.assertIsNotNone(lora_utils.get_lora_by_filename(self.relative_path))
+
+        late = os.path.join("Qwen", "anime", "Late.safetensors")
+        self._write_lora(self.tmp_extra.name, late)
+        self.assertIsNone(lora_utils.get_lora_by_filename(late))
+        lora_utils.invalidate_dir_cache()
+        self.assertEqual(lora_utils.get_lora_by_filename(late), late)
+
+        later = os.path.join("Qwen", "anime", "Later.safetensors")
+        self._write_lora(self.tmp_extra.name, later)
+        self.assertIsNone(lora_utils.get_lora_by_filename(later))
+        lora_utils._SCAN_CHECKED_AT.clear()  # as if the recheck interval had passed
+        self.assertEqual(lora_utils.get_lora_by_filename(later), later)
+
+    def test_preloaded_loras_skip_lookup(self):
+        nested = self.relative_path.replace(os.sep, "/")
+        lora_utils.preload_loras([nested, "missing.safetensors"])
+        self.get_full_path_calls = 0
+        lora_utils.folder_paths.get_folder_paths = None  # any directory lookup would now fail
+
+        self.assertEqual(os.path.normpath(lora_utils.resolve_lora_full_path(nested)), os.path.normpath(self.file_path))
+        self.assertEqual(self.get_full_path_calls, 0)
+
+        lora_utils.clear_preloaded_loras()
+        self.assertIsNone(lora_utils._preloaded_path(nested))
+
+    def test_folder_added_after_first_lookup(self):
+        expected = self.relative_path.replace(os.sep, "/")
+        self.assertEqual(lora_utils.get_lora_by_filename(expected), expected)
+
+        late_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(late_dir.cleanup)
+        late_file = self._write_lora(late_dir.name, "Late.safetensors")
+        lora_utils.folder_paths.get_folder_paths = lambda category: [
+            self.tmp_default.name, self.tmp_extra.name, late_dir.name
+        ]
+
+        self.assertEqual(lora_utils.get_lora_by_filename("Late.safetensors"), "Late.safetensors")
+        self.assertEqual(
+            os.path.normpath(lora_utils.resolve_lora_full_path("Late.safetensors")), os.path.normpath(late_file)
+        )
+
+    def test_get_lora_by_filename_is_case_insensitive(self):
+        expected = self.relative_path.replace(os.sep, "/")
+        self.assertEqual(lora_utils.get_lora_by_filename(expected), expected)
+        self.assertEqual(lora_utils.get_lora_by_filename(expected.upper()), expected)
+        self.assertIsNone(lora_utils.get_lora_by_filename("missing.safetensors"))
+
+    def test_prefix_match_lists_folder(self):
+        self._write_lora(self.tmp_default.name, os.path.join("Qwen", "realistic", "Photo.safetensors"))
+
+        self.assertEqual(lora_utils.prefix_match("Qwen/anime"), [self.relative_path])
+        self.assertEqual(
+            lora_utils.prefix_match("Qwen"),
+            sorted([self.relative_path, os.path.join("Qwen", "realistic", "Photo.safetensors")]),
+        )
+        self.assertEqual(lora_utils.prefix_match("Flux"), [])
+
+    def test_extract_trigger_words_reads_safetensors_header(self):
+        tag_frequency = {"set_a": {"mystic": 5, "anime": 9}, "set_b": {"mystic": 7, "glow": 1}}
+        header = json.dumps({"__metadata__": {"ss_tag_frequency": json.dumps(tag_frequency)}}).encode("utf-8")
+        self._write_lora(
+            self.tmp_extra.name,
+            os.path.join("Qwen", "anime", "Tagged.safetensors"),
+            len(header).to_bytes(8, "little") + header,
+        )
+
+        words = lora_utils.extract_trigger_words("Qwen/anime/Tagged.safetensors", max_words=2)
+        self.assertEqual(words, ["mystic", "anime"])
+
+    def test_extract_trigger_words_ignores_non_safetensors(self):
+        self.assertEqual(lora_utils.extract_trigger_words(self.relative_path.replace(os.sep, "/")), [])
+
+
+class ValidateLoraConfigTests(unittest.TestCase):
+    def test_accepts_numeric_strengths(self):
+        self.assertTrue(lora_utils.validate_lora_config({"lora": "a", "enabled": True, "strength_model": 0.8}))
+        self.assertTrue(lora_utils.validate_lora_config({"lora": "a", "enabled": True, "strength_model": "-1.5e-1"}))
+
+    def test_rejects_invalid_strengths(self):
+        self.assertFalse(lora_utils.validate_lora_config({"lora": "a", "enabled": True, "strength_model": "strong"}))
+        self.assertFalse(lora_utils.validate_lora_config({"lora": "a", "enabled": True, "strength_clip": None}))
+        self.assertFalse(lora_utils.validate_lora_config({"lora": "a"}))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,134 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from aiohttp import web
+from aiohttp.test_utils import AioHTTPTestCase
+
+from backend import web_api
+
+
+def _write(path: str, data: bytes = b"stub") -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as handle:
+        handle.write(data)
+
+
+class SubtreePruningTests(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        _write(os.path.join(self.root, "top.safetensors"))
+        _write(os.path.join(self.root, "previews", "top.png"))
+        _write(os.path.join(self.root, "previews", "nested", "top.json"))
+        web_api._DIR_EXT_CACHE.clear()
+        self.addCleanup(web_api._DIR_EXT_CACHE.clear)
+        self.supported = frozenset({".safetensors"})
+
+    def _scan(self):
+        listed = []
+        real_scandir = os.scandir
+
+        def scandir(path):
+            listed.append(path)
+            return real_scandir(path)
+
+        with mock.patch.object(web_api.os, "scandir", scandir):
+            paths = sorted(record["path"] for record in web_api._iter_dir_files(self.root, self.supported))
+        return paths, listed
+
+    def test_sidecar_only_subtree_is_pruned(self):
+        paths, _ = self._scan()
+        self.assertEqual(paths, ["top.safetensors"])
+
+        paths, listed = self._scan()
+        self.assertEqual(paths, ["top.safetensors"])
+        self.assertEqual(listed, [self.root])
+
+    def test_pruned_subtree_is_rescanned_after_deep_addition(self):
+        self._scan()
+        _write(os.path.join(self.root, "previews", "nested", "deeper", "new.safetensors"))
+
+        paths, _ = self._scan()
+        self.assertEqual(paths, ["previews/nested/deeper/new.safetensors", "top.safetensors"])
+
+    def test_deleted_directory_is_evicted(self):
+        self._scan()
+        nested = os.path.join(self.root, "previews", "nested")
+        os.remove(os.path.join(nested, "top.json"))
+        os.rmdir(nested)
+
+        self._scan()
+        self.assertNotIn(nested, web_api._DIR_EXT_CACHE)
+
+
+class FileListingApiTests(AioHTTPTestCase):
+    async def get_application(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        # Enough files for the listing to pass the compression threshold
+        for index in range(60):
+            _write(os.path.join(self.root, "set", f"lora_{index:02d}.safetensors"))
+        _write(os.path.join(self.root, "set", "readme.txt"))
+
+        patcher = mock.patch.object(web_api, "folder_paths", SimpleNamespace(
+            map_legacy=lambda name: name,
+            folder_names_and_paths={"loras": ([self.root], {".safetensors"})},
+        ))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        web_api._LIST_CACHE.clear()
+        self.addCleanup(web_api._LIST_CACHE.clear)
+
+        app = web.Application()
+        web_api.register_routes(app)
+        return app
+
+    async def test_listing_revalidates_with_etag(self):
+        resp = await self.client.get("/super_lora/files?folder_name=loras")
+        self.assertEqual(resp.status, 200)
+        data = await resp.json()
+        self.assertEqual(data["total"], 60)
+        etag = resp.headers["ETag"]
+
+        resp = await self.client.get("/super_lora/files?folder_name=loras", headers={"If-None-Match": etag})
+        self.assertEqual(resp.status, 304)
+
+    async def test_large_listing_is_compressed(self):
+        resp = await self.client.get("/super_lora/files?folder_name=loras", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(resp.headers.get("Content-Encoding"), "gzip")
+        self.assertEqual((await resp.json())["total"], 60)
+
+        resp = await self.client.get("/super_lora/files?folder_name=loras", headers={"Accept-Encoding": "identity"})
+        self.assertNotIn("Content-Encoding", resp.headers)
+
+    async def test_unsorted_listing_streams_every_file(self):
+        with mock.patch.object(web_api, "_STREAM_BATCH", 7):
+            resp = await self.client.get("/super_lora/files?folder_name=loras&sorted=0")
+            data = await resp.json(content_type=None)
+        self.assertEqual(data["total"], 60)
+        self.assertEqual(
+            sorted(record["path"] for record in data["files"]),
+            [f"set/lora_{index:02d}.safetensors" for index in range(60)],
+        )
+
+    async def test_listing_cache_expires(self):
+        await self.client.get("/super_lora/files?folder_name=loras")
+        # Nested change: the root mtime stays the same, so only the TTL notices it
+        _write(os.path.join(self.root, "set", "late.safetensors"))
+
+        resp = await self.client.get("/super_lora/files?folder_name=loras")
+        self.assertEqual((await resp.json())["total"], 60)
+
+        for key, (_, mtimes, listing) in list(web_api._LIST_CACHE.items()):
+            web_api._LIST_CACHE[key] = (0.0, mtimes, listing)  # TTL ran out
+        resp = await self.client.get("/super_lora/files?folder_name=loras")
+        self.assertEqual((await resp.json())["total"], 61)
+
+
+if __name__ == "__main__":
+    unittest.main()